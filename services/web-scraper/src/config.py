@@ -3,8 +3,10 @@ Configuration management for Web Scraper Service
 """
 import os
 from dataclasses import dataclass
+from enum import StrEnum
+from functools import lru_cache
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -17,18 +19,38 @@ class Settings(BaseSettings):
     database_name: str = Field(default="warhammer_meta", env="DATABASE_NAME")
     database_user: str = Field(default="warhammer_user", env="DATABASE_USER")
     database_password: str = Field(default="warhammer_secret_2024", env="DATABASE_PASSWORD")
+    database_pool_size: int = Field(
+        default=10,
+        env="DATABASE_POOL_SIZE",
+        description="Persistent connections kept open by the SQLAlchemy pool"
+    )
 
     # Redis Configuration
     redis_host: str = Field(default="redis", env="REDIS_HOST")
     redis_port: int = Field(default=6379, env="REDIS_PORT")
     redis_db: int = Field(default=0, env="REDIS_DB")
     redis_password: Optional[str] = Field(default=None, env="REDIS_PASSWORD")
+    redis_payload_ref_threshold: int = Field(
+        default=8192,
+        env="REDIS_PAYLOAD_REF_THRESHOLD",
+        description="Serialized size (bytes) above which pub/sub sends a key reference"
+    )
 
     # Scraper Configuration
     scraper_env: str = Field(default="development", env="SCRAPER_ENV")
     log_level: str = Field(default="INFO", env="SCRAPER_LOG_LEVEL")
     wahapedia_base_url: str = Field(default="https://wahapedia.ru", env="WAHAPEDIA_BASE_URL")
     rate_limit_delay: float = Field(default=2.0, env="RATE_LIMIT_DELAY")
+    scraper_workers: int = Field(
+        default=4,
+        env="SCRAPER_WORKERS",
+        description="Concurrent page fetches (still bound by the rate limit)"
+    )
+    html_parser: str = Field(
+        default="bs4",
+        env="HTML_PARSER",
+        description="Parser behind fetch_and_parse: bs4 (BeautifulSoup/lxml) or selectolax"
+    )
 
     # Application paths
     log_dir: str = Field(default="/app/logs", env="LOG_DIR")
@@ -51,15 +73,17 @@ class Settings(BaseSettings):
         description="Which scraper service to use"
     )
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        frozen=True
+    )
 
     @property
     def database_url(self) -> str:
         """Construct PostgreSQL connection URL"""
         return (
-            f"postgresql://{self.database_user}:{self.database_password}"
+            f"postgresql+psycopg://{self.database_user}:{self.database_password}"
             f"@{self.database_host}:{self.database_port}/{self.database_name}"
         )
 
@@ -81,8 +105,14 @@ class Settings(BaseSettings):
         return self.scraper_env.lower() in ("production", "prod")
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process"""
+    return Settings()
+
+
 # Create global settings instance
-settings = Settings()
+settings = get_settings()
 
 
 # Service identification
@@ -91,8 +121,8 @@ SERVICE_VERSION = "0.1.0"
 USER_AGENT = f"WH40K-Meta-Analyzer/{SERVICE_VERSION} (Web Scraper Bot)"
 
 # Redis Channel Names
-class RedisChannels:
-    """Redis pub/sub channel definitions"""
+class RedisChannels(StrEnum):
+    """Redis pub/sub channel definitions (members are plain str values)"""
     FACTION_DISCOVERED = "scraper:faction:discovered"
     UNIT_EXTRACTED = "scraper:unit:extracted"
     ENHANCEMENT_FOUND = "scraper:enhancement:found"
@@ -103,14 +133,13 @@ class RedisChannels:
     VERSION_CHANGE_DETECTED = "scraper:version:change"
 
 # Message Types
-class MessageTypes:
-    """Message type identifiers for Redis pub/sub"""
+class MessageTypes(StrEnum):
+    """Message type identifiers for Redis pub/sub (members are plain str values)"""
     FACTION_DISCOVERED = "faction_discovered"
     UNIT_EXTRACTED = "unit_extracted"
+    UNITS_BATCH = "units_batch"
     ENHANCEMENT_FOUND = "enhancement_found"
     WARGEAR_FOUND = "wargear_found"
     STATUS_UPDATE = "status_update"
     ERROR_REPORT = "error_report"
     VERSION_CHANGE = "version_change"
-
-# Remove the patch code at the bottom - it's not needed anymore
@@ -5,6 +5,9 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 
 class BaseScraperService(ABC):
+    # Fixed attribute layout; subclasses declare their own __slots__ too
+    __slots__ = ("context", "version_id", "service_name")
+
     def __init__(self, context):
         self.context = context
         self.version_id = context.get_version_id()
@@ -18,6 +21,11 @@ class BaseScraperService(ABC):
     def get_army_rules(self, faction: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         pass
 
+    def get_all_army_rules(self, factions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # One faction at a time; services that can fetch pages concurrently override this
+        results = (self.get_army_rules(faction) for faction in factions)
+        return [result for result in results if result]
+
     @abstractmethod
     def get_detachments(self, faction: Dict[str, Any]) -> List[Dict[str, Any]]:
         pass
@@ -1,14 +1,11 @@
 """
 Scraper Context - No database dependency
 """
-import sys
-sys.path.insert(0, "/app/src")
-
-from core.version_controller import VersionController
+from src.core.version_controller import get_version_controller
 
 class ScraperContext:
     def __init__(self):
-        self.version_controller = VersionController()
+        self.version_controller = get_version_controller()
         self._snapshot_data = None
     
     def get_version_id(self):
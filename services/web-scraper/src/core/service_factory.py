@@ -1,49 +1,58 @@
 """
 Service Factory
 """
-import sys
-sys.path.insert(0, "/app/src")
+import threading
+from importlib import import_module
 
 from typing import Dict, Type, Optional, List
-from core.base_scraper_service import BaseScraperService
-from core.scraper_context import ScraperContext
+from src.core.base_scraper_service import BaseScraperService
+from src.core.scraper_context import ScraperContext
+
+# Built-in services as "module:Class", imported the first time they're created
+DEFAULT_SERVICES = {
+    "wahapedia": "src.services.wahapedia.wahapedia_service:WahapediaService",
+}
 
 class ServiceFactory:
     def __init__(self):
         self.context = ScraperContext()
         self._services = {}
-        self._register_default_services()
-
-    def _register_default_services(self):
-        try:
-            from services.wahapedia.wahapedia_service import WahapediaService
-            self.register_service("wahapedia", WahapediaService)
-        except ImportError as e:
-            print(f"Could not import WahapediaService: {e}")
+        self._lazy_services = dict(DEFAULT_SERVICES)
 
     def register_service(self, name: str, service_class: Type[BaseScraperService]):
         if not issubclass(service_class, BaseScraperService):
             raise ValueError(f"{service_class} must extend BaseScraperService")
         self._services[name] = service_class
+        self._lazy_services.pop(name, None)
+
+    def _resolve_service(self, name: str) -> Type[BaseScraperService]:
+        if name not in self._services:
+            module_name, class_name = self._lazy_services[name].split(":")
+            self.register_service(name, getattr(import_module(module_name), class_name))
+        return self._services[name]
 
     def create_service(self, service_name: Optional[str] = None) -> BaseScraperService:
         name = service_name or "wahapedia"
-        if name not in self._services:
-            available = list(self._services.keys())
+        if name not in self._services and name not in self._lazy_services:
+            available = self.get_available_services()
             raise ValueError(f"Service {name} not registered. Available: {available}")
-        service_class = self._services[name]
+        service_class = self._resolve_service(name)
         return service_class(self.context)
 
     def get_available_services(self) -> List[str]:
-        return list(self._services.keys())
+        return list(self._services.keys()) + list(self._lazy_services.keys())
 
     def get_default_service(self) -> BaseScraperService:
         return self.create_service()
 
 _factory_instance = None
+_factory_lock = threading.Lock()
 
 def get_service_factory() -> ServiceFactory:
     global _factory_instance
+    # Double-checked so concurrent first calls build only one factory
     if _factory_instance is None:
-        _factory_instance = ServiceFactory()
+        with _factory_lock:
+            if _factory_instance is None:
+                _factory_instance = ServiceFactory()
     return _factory_instance
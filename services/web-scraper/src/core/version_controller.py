@@ -1,6 +1,7 @@
 """
 Version Controller - No external dependencies
 """
+import threading
 
 class VersionController:
     """Simple version controller with hardcoded values."""
@@ -21,3 +22,15 @@ class VersionController:
             "version_id": self.version_id,
             "version_name": self.version_name
         }
+
+_controller_instance = None
+_controller_lock = threading.Lock()
+
+def get_version_controller() -> VersionController:
+    global _controller_instance
+    # Fields are read-only after creation, so only construction is locked
+    if _controller_instance is None:
+        with _controller_lock:
+            if _controller_instance is None:
+                _controller_instance = VersionController()
+    return _controller_instance
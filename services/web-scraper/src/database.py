@@ -3,6 +3,7 @@
 Database connection and management for Wahapedia Scraper
 """
 import sys
+import atexit
 from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Generator
@@ -13,7 +14,6 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
 
 from src.config import settings
 from src.utils.logging import get_logger
@@ -21,6 +21,49 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 Base = declarative_base()
 
+# Executions before psycopg prepares a statement server-side
+PREPARE_THRESHOLD = 1
+
+# Connection pool: extra connections allowed past pool_size under bursts,
+# and seconds before a pooled connection is replaced
+POOL_MAX_OVERFLOW = 20
+POOL_RECYCLE = 1800
+
+# Tables verify_schema expects in the public schema, in report order
+EXPECTED_TABLES = (
+    'warhammer_major_versions',
+    'warhammer_updates',
+    'version_snapshots',
+    'factions',
+    'faction_versions',
+    'detachments',
+    'enhancements',
+    'units',
+    'unit_versions',
+    'unit_enhancement_compatibility',
+    'wargear',
+    'unit_wargear_options',
+    'wahapedia_scrape_state',
+    'source_mappings',
+    'scrape_logs',
+    'redis_messages',
+)
+
+# Built once; SQLAlchemy caches its compiled form and psycopg prepares it
+CURRENT_VERSION_QUERY = text("""
+    SELECT 
+        vs.id as version_snapshot_id,
+        wmv.version_number as major_version,
+        wu.version_code as update_code,
+        wu.name as update_name,
+        vs.effective_date
+    FROM version_snapshots vs
+    JOIN warhammer_major_versions wmv ON vs.major_version_id = wmv.id
+    LEFT JOIN warhammer_updates wu ON vs.update_id = wu.id
+    WHERE vs.is_current = TRUE
+    LIMIT 1
+""")
+
 
 class DatabaseManager:
     """Manages database connections and operations"""
@@ -29,16 +72,24 @@ class DatabaseManager:
         self.database_url = database_url or settings.database_url
         self.engine: Optional[Engine] = None
         self.SessionLocal: Optional[sessionmaker] = None
+        self._verified_schema: Optional[tuple] = None  # (engine, results)
         
     def initialize(self) -> bool:
         """Initialize database connection"""
         try:
-            # Create engine with connection pooling
+            # Create engine with connection pooling; pre-ping replaces
+            # connections Postgres dropped while they sat idle in the pool
             self.engine = create_engine(
                 self.database_url,
-                poolclass=NullPool,  # Don't pool connections in container environment
+                pool_size=settings.database_pool_size,
+                max_overflow=POOL_MAX_OVERFLOW,
+                pool_recycle=POOL_RECYCLE,
+                pool_pre_ping=True,
                 echo=settings.is_development,  # Log SQL in development
-                future=True
+                future=True,
+                # psycopg 3 switches a query to a server-side prepared
+                # statement once it has run this many times on a connection
+                connect_args={"prepare_threshold": PREPARE_THRESHOLD}
             )
             
             # Create session factory
@@ -87,53 +138,52 @@ class DatabaseManager:
             return False
     
     def verify_schema(self) -> dict:
-        """Verify that expected tables exist"""
-        expected_tables = [
-            'warhammer_major_versions',
-            'warhammer_updates', 
-            'version_snapshots',
-            'factions',
-            'faction_versions',
-            'detachments',
-            'enhancements',
-            'units',
-            'unit_versions',
-            'unit_enhancement_compatibility',
-            'wargear',
-            'unit_wargear_options',
-            'wahapedia_scrape_state',
-            'source_mappings',
-            'scrape_logs',
-            'redis_messages'
-        ]
+        """
+        Verify that expected tables exist
+        
+        A complete schema is remembered for the current engine, so repeat
+        calls skip the query; incomplete results are always re-checked.
+        """
+        if self._verified_schema and self._verified_schema[0] is self.engine:
+            return dict(self._verified_schema[1])
         
         results = {}
         
         try:
             with self.engine.connect() as conn:
-                # Check which tables exist
+                # Check which of the expected tables exist in one query
                 query = text("""
                     SELECT table_name 
                     FROM information_schema.tables 
-                    WHERE table_schema = 'public'
+                    WHERE table_schema = :schema
+                      AND table_name = ANY(:tables)
                 """)
                 
-                existing_tables = {row[0] for row in conn.execute(query)}
-                
-                for table in expected_tables:
-                    results[table] = table in existing_tables
+                existing_tables = {
+                    row[0] for row in conn.execute(
+                        query,
+                        {"schema": "public", "tables": list(EXPECTED_TABLES)}
+                    )
+                }
                 
-                # Count tables
-                total_expected = len(expected_tables)
-                total_found = sum(1 for v in results.values() if v)
+                # Record presence and collect the missing tables in one pass
+                missing = []
+                for table in EXPECTED_TABLES:
+                    found = table in existing_tables
+                    results[table] = found
+                    if not found:
+                        missing.append(table)
                 
                 logger.info(
                     "schema_verification_complete",
-                    tables_found=total_found,
-                    tables_expected=total_expected,
-                    missing=[k for k, v in results.items() if not v]
+                    tables_found=len(EXPECTED_TABLES) - len(missing),
+                    tables_expected=len(EXPECTED_TABLES),
+                    missing=missing
                 )
                 
+                if not missing:
+                    self._verified_schema = (self.engine, dict(results))
+                
         except Exception as e:
             logger.error("schema_verification_failed", error=str(e))
             
@@ -142,8 +192,9 @@ class DatabaseManager:
     def create_test_entry(self) -> bool:
         """Create a test entry to verify write permissions"""
         try:
-            with self.engine.connect() as conn:
-                # Try to insert a test scrape log
+            # One transaction that is rolled back: proves INSERT permission
+            # without a commit and leaves no row behind, even on error
+            with self.engine.connect() as conn, conn.begin() as trans:
                 query = text("""
                     INSERT INTO scrape_logs 
                     (source, scrape_type, status, started_at, items_processed)
@@ -162,15 +213,11 @@ class DatabaseManager:
                         "items_processed": 0
                     }
                 )
-                conn.commit()
                 
                 test_id = result.scalar()
+                trans.rollback()
                 logger.info("database_write_test_successful", test_id=test_id)
                 
-                # Clean up test entry
-                conn.execute(text("DELETE FROM scrape_logs WHERE id = :id"), {"id": test_id})
-                conn.commit()
-                
                 return True
                 
         except Exception as e:
@@ -181,21 +228,7 @@ class DatabaseManager:
         """Get current game version from database"""
         try:
             with self.engine.connect() as conn:
-                query = text("""
-                    SELECT 
-                        vs.id as version_snapshot_id,
-                        wmv.version_number as major_version,
-                        wu.version_code as update_code,
-                        wu.name as update_name,
-                        vs.effective_date
-                    FROM version_snapshots vs
-                    JOIN warhammer_major_versions wmv ON vs.major_version_id = wmv.id
-                    LEFT JOIN warhammer_updates wu ON vs.update_id = wu.id
-                    WHERE vs.is_current = TRUE
-                    LIMIT 1
-                """)
-                
-                result = conn.execute(query).first()
+                result = conn.execute(CURRENT_VERSION_QUERY).first()
                 
                 if result:
                     return {
@@ -216,12 +249,16 @@ class DatabaseManager:
         """Close database connections"""
         if self.engine:
             self.engine.dispose()
+            self.engine = None
             logger.info("database_connections_closed")
 
 
 # Global database manager instance
 db_manager = DatabaseManager()
 
+# Return pooled connections to Postgres cleanly on interpreter exit
+atexit.register(db_manager.close)
+
 
 def init_database() -> bool:
     """Initialize the database connection"""
@@ -2,11 +2,46 @@
 """
 Wahapedia Scraper Service - Main Entry Point
 """
-import time
 import sys
 import os
+import logging
+import threading
+
+from src.config import settings, RedisChannels
+from src.utils.logging import setup_logging, get_logger
+from src.redis_client import redis_manager, init_redis
+
+logger = get_logger(__name__)
+
+# Seconds between heartbeat log lines (only emitted at DEBUG level)
+HEARTBEAT_INTERVAL = 60
+
+
+def handle_scrape_command(message):
+    """Handle a scrape command received over Redis"""
+    logger.info(
+        "scrape_command_received",
+        message_type=message.get('type'),
+        status=message.get('status'),
+        details=message.get('details')
+    )
+
+
+def _heartbeat():
+    """Log a heartbeat and schedule the next one"""
+    logger.debug("scraper_service_alive")
+    timer = threading.Timer(HEARTBEAT_INTERVAL, _heartbeat)
+    timer.daemon = True
+    timer.start()
+
 
 def main():
+    setup_logging(
+        log_level=settings.log_level,
+        log_dir=settings.log_dir,
+        enable_json=False
+    )
+
     print("=" * 50)
     print("Wahapedia Scraper Service Starting...")
     print("=" * 50)
@@ -14,12 +49,23 @@ def main():
     print(f"Database Host: {os.getenv('DATABASE_HOST', 'not set')}")
     print(f"Redis Host: {os.getenv('REDIS_HOST', 'not set')}")
     print("=" * 50)
+
+    if not init_redis():
+        print("Could not connect to Redis, exiting.")
+        sys.exit(1)
+
+    # Block on the subscriber thread instead of polling: the process stays
+    # idle until a command arrives on the channel
+    redis_manager.subscribe(RedisChannels.SCRAPING_STARTED, handle_scrape_command)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        _heartbeat()
+
     print("Service is ready and waiting for commands...")
-    
-    # Keep the container running
-    while True:
-        time.sleep(60)
-        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Scraper service is alive...")
+    redis_manager.subscriber_thread.join()
+
+    logger.error("subscriber_thread_stopped")
+    sys.exit(1)
 
 if __name__ == "__main__":
     main()
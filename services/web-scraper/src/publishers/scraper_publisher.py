@@ -1,13 +1,13 @@
 # services/web-scraper/src/publishers/scraper_publisher.py
 
-import sys
-sys.path.insert(0, '/app/src')
-
-import json
+import functools
+import orjson
 from typing import Dict, List, Any
-from datetime import datetime
-from redis_client import redis_manager  # Use the existing redis_manager
-import logging
+from src.redis_client import redis_manager  # Use the existing redis_manager
+from src.utils.logging import get_logger
+
+# Configured once by the application's logging setup, not per instance
+logger = get_logger("ScraperPublisher")
 
 class ScraperPublisher:
     """Publisher for scraped Wahapedia data to Redis channels."""
@@ -29,14 +29,7 @@ class ScraperPublisher:
         if not redis_manager.is_connected:
             redis_manager.initialize()
 
-        self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.setLevel(logging.INFO)
-
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+        self.logger = logger
 
     def publish_factions(self, factions: List[Dict[str, str]]) -> bool:
         """
@@ -52,11 +45,10 @@ class ScraperPublisher:
             message = {
                     'type': 'faction_list',
                     'count': len(factions),
-                    'data': factions,
-                    'timestamp': datetime.now().isoformat()
+                    'data': factions
                     }
 
-            # Use redis_manager's publish_message method
+            # publish_message stamps the timestamp and source
             success = redis_manager.publish_message(
                     self.CHANNELS['factions'], 
                     message
@@ -90,17 +82,19 @@ class ScraperPublisher:
             pipe.delete('wahapedia:faction_list')
             pipe.delete('wahapedia:faction_codes')
 
-            # Store each faction
-            for faction in factions:
+            # Encode each faction once and write them all with one
+            # multi-field HSET and one multi-value RPUSH
+            encoded = [orjson.dumps(faction) for faction in factions]
+
+            if encoded:
                 # Store in hash by code for quick lookup
                 pipe.hset(
                         'wahapedia:faction_codes',
-                        faction['code'],
-                        json.dumps(faction)
+                        mapping={faction['code']: value for faction, value in zip(factions, encoded)}
                         )
 
                 # Store in list for iteration
-                pipe.rpush('wahapedia:faction_list', json.dumps(faction))
+                pipe.rpush('wahapedia:faction_list', *encoded)
 
             # Set expiry (24 hours)
             pipe.expire('wahapedia:faction_codes', 86400)
@@ -112,6 +106,20 @@ class ScraperPublisher:
         except Exception as e:
             self.logger.error(f"Error storing factions: {str(e)}")
 
+    def get_stored_factions(self) -> List[Dict[str, str]]:
+        """
+        Read the faction list stored by _store_factions.
+
+        Returns:
+            List of faction dictionaries (empty if missing or expired)
+        """
+        try:
+            stored = redis_manager.client.lrange('wahapedia:faction_list', 0, -1)
+            return [orjson.loads(faction) for faction in stored]
+        except Exception as e:
+            self.logger.error(f"Error reading stored factions: {str(e)}")
+            return []
+
     def publish_status(self, status: str, details: Dict[str, Any] = None):
         """
         Publish scraping status updates.
@@ -123,8 +131,7 @@ class ScraperPublisher:
         try:
             message = {
                     'status': status,
-                    'details': details or {},
-                    'timestamp': datetime.now().isoformat()
+                    'details': details or {}
                     }
 
             redis_manager.publish_message(
@@ -136,3 +143,9 @@ class ScraperPublisher:
 
         except Exception as e:
             self.logger.error(f"Error publishing status: {str(e)}")
+
+
+@functools.cache
+def get_publisher() -> ScraperPublisher:
+    """Return the process-wide ScraperPublisher, created on first use"""
+    return ScraperPublisher()
@@ -2,12 +2,17 @@
 """
 Redis connection and pub/sub management for Wahapedia Scraper
 """
-import json
 import time
+import queue
 import threading
-from typing import Optional, Dict, Any, Callable, List
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List, TypedDict
 from datetime import datetime
+from uuid import uuid4
 
+import msgpack
+import orjson
 import redis
 from redis.exceptions import ConnectionError, TimeoutError
 
@@ -17,40 +22,125 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+def _default(obj: Any) -> Any:
+    """Serialize values msgpack/orjson don't handle natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+class UnitsBatch(TypedDict):
+    """Units packed column-wise: index i of each list describes one unit"""
+    names: List[str]
+    factions: List[str]
+    points: List[int]
+
+
+def to_units_batch(units: List[Dict[str, Any]]) -> UnitsBatch:
+    """Pack unit dictionaries into a column-wise UnitsBatch"""
+    return {
+        "names": [unit.get("name") for unit in units],
+        "factions": [unit.get("faction") for unit in units],
+        "points": [unit.get("points") for unit in units],
+    }
+
+
+# Connection settings shared by every pool
+CONNECTION_OPTIONS = {
+    "decode_responses": False,  # msgpack payloads are raw bytes
+    "socket_connect_timeout": 5,
+    "socket_timeout": 5,
+    "retry_on_timeout": True,
+    "health_check_interval": 30,  # keep idle subscriber connections warm
+}
+MAX_CONNECTIONS = 32
+
+# One pool per process for the configured Redis, so every client built on it
+# reuses open sockets instead of reconnecting
+_pool = redis.ConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=MAX_CONNECTIONS,
+    **CONNECTION_OPTIONS
+)
+
+# Seconds a by-reference payload stays readable by subscribers
+PAYLOAD_REF_TTL = 600
+
+# Subscriber dispatch: received messages are queued and handed to a small
+# worker pool so slow handlers never stall the socket reader
+MESSAGE_QUEUE_SIZE = 4096
+DISPATCH_BATCH_SIZE = 32
+HANDLER_WORKERS = 4
+
+# Seconds a channel's subscriber count is reused before asking Redis again
+SUBSCRIBER_CACHE_TTL = 1.0
+
+# Streams keep a replayable log in one XADD; trimmed approximately to this
+STREAM_MAXLEN = 1000
+
+
 class RedisManager:
     """Manages Redis connections and pub/sub operations"""
     
-    def __init__(self, redis_url: str = None):
+    def __init__(self, redis_url: str = None, serializer: str = "msgpack"):
         self.redis_url = redis_url or settings.redis_url
         self.client: Optional[redis.Redis] = None
         self.pubsub: Optional[redis.client.PubSub] = None
         self.subscriber_thread: Optional[threading.Thread] = None
+        self.dispatch_thread: Optional[threading.Thread] = None
+        self._msg_queue: queue.Queue = queue.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+        self._worker_pool: Optional[ThreadPoolExecutor] = None
+        # Messages waiting per channel, and channels with a worker draining them
+        self._channel_pending: Dict[str, deque] = defaultdict(deque)
+        self._channel_running: set = set()
+        self._channel_lock = threading.Lock()
         self.message_handlers: Dict[str, List[Callable]] = {}
         self.is_connected = False
+        self._server_info: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self.payload_ref_threshold = settings.redis_payload_ref_threshold
+        self._stream_groups: set = set()
+        self._sub_cache: Dict[str, tuple] = {}  # channel -> (checked_at, count)
+        
+        # Payload serializer; "json" keeps messages human-readable for debugging
+        self.serializer = serializer
+        if serializer == "json":
+            self._pack = lambda message: orjson.dumps(
+                message, default=_default, option=orjson.OPT_NON_STR_KEYS
+            )
+            self._unpack = orjson.loads
+        else:
+            self._pack = lambda message: msgpack.packb(message, use_bin_type=True, default=_default)
+            # Non-str map keys are allowed, as the JSON path turns them into strings
+            self._unpack = lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
         
     def initialize(self) -> bool:
         """Initialize Redis connection"""
         try:
-            # Create Redis client
-            self.client = redis.from_url(
-                self.redis_url,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
+            # Create Redis client on the shared pool (own pool for other URLs)
+            if self.redis_url == settings.redis_url:
+                pool = _pool
+            else:
+                pool = redis.ConnectionPool.from_url(
+                    self.redis_url,
+                    max_connections=MAX_CONNECTIONS,
+                    **CONNECTION_OPTIONS
+                )
+            self.client = redis.Redis(connection_pool=pool)
             
             # Test connection
             self.client.ping()
             self.is_connected = True
             
-            # Get Redis info
-            info = self.client.info()
+            # Fetch only the INFO sections we log, and keep them for reuse
+            self._server_info = {
+                **self.client.info(section='server'),
+                **self.client.info(section='memory')
+            }
             logger.info(
                 "redis_connected",
-                redis_version=info.get('redis_version'),
-                used_memory=info.get('used_memory_human'),
-                connected_clients=info.get('connected_clients')
+                redis_version=self._server_info.get('redis_version'),
+                used_memory=self._server_info.get('used_memory_human')
             )
             
             return True
@@ -86,13 +176,8 @@ class RedisManager:
             if not self.client:
                 raise RuntimeError("Redis not initialized")
             
-            # Add metadata to message
-            message['timestamp'] = datetime.now().isoformat()
-            message['source'] = 'web-scraper'
-            
-            # Serialize and publish
-            message_json = json.dumps(message)
-            subscribers = self.client.publish(channel, message_json)
+            # Publish and record in the recent list in one round trip
+            subscribers = self._publish_pipelined(channel, [message])[0]
             
             logger.debug(
                 "message_published",
@@ -101,8 +186,41 @@ class RedisManager:
                 subscribers=subscribers
             )
             
-            # Also save to redis_messages table tracking
-            self._track_message(channel, message)
+            return True
+            
+        except Exception as e:
+            logger.error(
+                "publish_failed",
+                channel=channel,
+                error=str(e)
+            )
+            return False
+    
+    def publish_batch(self, channel: str, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Publish several messages to a Redis channel in a single round trip
+        
+        Args:
+            channel: Channel name to publish to
+            messages: Message dictionaries to publish, in order
+            
+        Returns:
+            Success status
+        """
+        if not messages:
+            return True
+        
+        try:
+            if not self.client:
+                raise RuntimeError("Redis not initialized")
+            
+            self._publish_pipelined(channel, messages)
+            
+            logger.debug(
+                "batch_published",
+                channel=channel,
+                count=len(messages)
+            )
             
             return True
             
@@ -114,16 +232,208 @@ class RedisManager:
             )
             return False
     
-    def _track_message(self, channel: str, message: Dict[str, Any]):
-        """Track published message in Redis for monitoring"""
+    def publish_stream(self, stream: str, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Append messages to a Redis stream in a single round trip
+        
+        A stream is both the fan-out and the replay log, so each message is
+        one XADD instead of a PUBLISH plus LPUSH/LTRIM.
+        
+        Args:
+            stream: Stream key to append to
+            messages: Message dictionaries to append, in order
+            
+        Returns:
+            Success status
+        """
+        if not messages:
+            return True
+        
         try:
-            # Store recent messages in a Redis list for debugging
-            key = f"messages:{channel}:recent"
-            self.client.lpush(key, json.dumps(message))
-            self.client.ltrim(key, 0, 99)  # Keep only last 100 messages
-            self.client.expire(key, 3600)  # Expire after 1 hour
+            if not self.client:
+                raise RuntimeError("Redis not initialized")
+            
+            pipe = self.client.pipeline(transaction=False)
+            for message in messages:
+                pipe.xadd(
+                    stream,
+                    {"payload": self._encode(message)},
+                    maxlen=STREAM_MAXLEN,
+                    approximate=True
+                )
+            pipe.execute()
+            
+            logger.debug(
+                "stream_appended",
+                stream=stream,
+                count=len(messages)
+            )
+            
+            return True
+            
         except Exception as e:
-            logger.debug("message_tracking_failed", error=str(e))
+            logger.error(
+                "publish_failed",
+                channel=stream,
+                error=str(e)
+            )
+            return False
+    
+    def read_stream(self, stream: str, group: str, consumer: str,
+                    count: int = 64, block: Optional[int] = 1000) -> List[tuple]:
+        """
+        Read new stream entries as part of a consumer group
+        
+        Entries stay pending until passed to ack_stream, so ack only after
+        handling them; unacked entries can be claimed again after a crash.
+        
+        Args:
+            stream: Stream key to read
+            group: Consumer group name (created on first use)
+            consumer: Consumer name within the group
+            count: Maximum entries returned per call
+            block: Milliseconds to wait for new entries (None returns at once)
+            
+        Returns:
+            (entry_id, message) pairs, oldest first
+        """
+        if (stream, group) not in self._stream_groups:
+            try:
+                self.client.xgroup_create(stream, group, id="$", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._stream_groups.add((stream, group))
+        
+        response = self.client.xreadgroup(
+            group, consumer, {stream: ">"}, count=count, block=block
+        )
+        
+        entries = []
+        for _, stream_entries in response or []:
+            for entry_id, fields in stream_entries or []:
+                entries.append((entry_id, self._unpack(fields[b"payload"])))
+        return entries
+    
+    def ack_stream(self, stream: str, group: str, entry_ids: List[bytes]) -> int:
+        """
+        Acknowledge handled stream entries for a consumer group
+        
+        Args:
+            stream: Stream key the entries were read from
+            group: Consumer group name
+            entry_ids: Entry ids returned by read_stream
+            
+        Returns:
+            Number of entries acknowledged
+        """
+        if not entry_ids:
+            return 0
+        return self.client.xack(stream, group, *entry_ids)
+    
+    def _publish_pipelined(self, channel: str, messages: List[Dict[str, Any]]) -> List[int]:
+        """
+        Publish messages and track them in the channel's recent list
+        
+        PUBLISH, LPUSH, LTRIM and EXPIRE are sent in one pipeline, so any
+        number of messages costs a single round trip. Channels nobody is
+        listening on skip the PUBLISH (and any by-reference body) and only
+        keep the recent list.
+        
+        Args:
+            channel: Channel name to publish to
+            messages: Message dictionaries to publish, in order
+            
+        Returns:
+            Subscriber count for each message
+        """
+        pipe = self.client.pipeline(transaction=False)
+        publish_positions = self._queue_publish(pipe, channel, messages)
+        results = pipe.execute()
+        if publish_positions is None:
+            return [0] * len(messages)
+        
+        counts = [results[position] for position in publish_positions]
+        self._sub_cache[channel] = (time.monotonic(), counts[-1])
+        return counts
+    
+    def _queue_publish(self, pipe, channel: str,
+                       messages: List[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        Queue the commands of _publish_pipelined on a pipeline
+        
+        Args:
+            pipe: Pipeline to queue on (executed by the caller)
+            channel: Channel name to publish to
+            messages: Message dictionaries to publish, in order
+            
+        Returns:
+            Pipeline positions of the PUBLISH replies, or None if the channel
+            had no subscribers and nothing was published
+        """
+        key = f"messages:{channel}:recent"
+        live = settings.is_development or self._has_subscribers(channel)
+        publish_positions = []
+        for message in messages:
+            payload = self._encode(message)
+            if live:
+                wire = self._by_reference(pipe, message, payload)
+                publish_positions.append(len(pipe))
+                pipe.publish(channel, wire)
+            pipe.lpush(key, payload)
+        pipe.ltrim(key, 0, 99)  # Keep only last 100 messages
+        pipe.expire(key, 3600)  # Expire after 1 hour
+        return publish_positions if live else None
+    
+    def _has_subscribers(self, channel: str) -> bool:
+        """
+        Whether anyone receives PUBLISH on a channel, cached briefly
+        
+        Pattern subscriptions aren't counted per channel by NUMSUB, so any
+        active pattern counts as a listener.
+        """
+        now = time.monotonic()
+        cached = self._sub_cache.get(channel)
+        if cached is None or now - cached[0] > SUBSCRIBER_CACHE_TTL:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.pubsub_numsub(channel)
+            pipe.pubsub_numpat()
+            numsub, numpat = pipe.execute()
+            cached = (now, numsub[0][1] + numpat)
+            self._sub_cache[channel] = cached
+        return cached[1] > 0
+    
+    def _encode(self, message: Dict[str, Any]) -> bytes:
+        """Add metadata to a message and serialize it"""
+        message['timestamp'] = time.time_ns()  # consumers format on demand
+        message['source'] = 'web-scraper'
+        return self._pack(message)
+    
+    def _by_reference(self, client, message: Dict[str, Any], payload: bytes) -> bytes:
+        """
+        Keep large payloads off the pub/sub buffers
+        
+        Payloads above the threshold are stored under their own key and only a
+        small reference message is published; subscribers GET the body.
+        
+        Args:
+            client: Redis client or pipeline to issue the SET on
+            message: Original message (for its type)
+            payload: Serialized message
+            
+        Returns:
+            Bytes to publish on the channel
+        """
+        if len(payload) <= self.payload_ref_threshold:
+            return payload
+        
+        key = f"payload:{uuid4().hex}"
+        client.set(key, payload, ex=PAYLOAD_REF_TTL)
+        return self._pack({
+            "type": message.get('type'),
+            "ref": key,
+            "size": len(payload)
+        })
     
     def subscribe(self, channel: str, handler: Callable[[Dict], None]):
         """
@@ -133,27 +443,55 @@ class RedisManager:
             channel: Channel to subscribe to
             handler: Function to call when message received
         """
-        if channel not in self.message_handlers:
-            self.message_handlers[channel] = []
-        self.message_handlers[channel].append(handler)
+        self.subscribe_many({channel: handler})
+    
+    def subscribe_many(self, mapping: Dict[str, Callable[[Dict], None]]):
+        """
+        Subscribe to several channels with a single SUBSCRIBE command
+        
+        Args:
+            mapping: Channel name to the handler called for its messages
+        """
+        new_channels = [channel for channel in mapping if channel not in self.message_handlers]
+        for channel in new_channels:
+            self._sub_cache.pop(channel, None)  # we're about to listen
+        for channel, handler in mapping.items():
+            self.message_handlers.setdefault(channel, []).append(handler)
         
         # Start subscriber thread if not running
         if not self.subscriber_thread or not self.subscriber_thread.is_alive():
             self._start_subscriber()
+        elif new_channels:
+            # Running listener picks the new channels up on its next poll
+            self.pubsub.subscribe(*new_channels)
+            logger.info("subscribed_to_channels", channels=new_channels)
     
     def _start_subscriber(self):
         """Start the subscriber thread"""
         if not self.client:
             raise RuntimeError("Redis not initialized")
         
+        self._stop.clear()
         self.pubsub = self.client.pubsub()
         
-        # Subscribe to all channels with handlers
-        for channel in self.message_handlers.keys():
-            self.pubsub.subscribe(channel)
-            logger.info("subscribed_to_channel", channel=channel)
+        # Subscribe to all channels with handlers in one round trip
+        channels = list(self.message_handlers)
+        self.pubsub.subscribe(*channels)
+        logger.info("subscribed_to_channels", channels=channels)
+        
+        # Start handler pool and dispatcher, then the listener feeding them
+        self._channel_pending.clear()
+        self._channel_running.clear()
+        self._worker_pool = ThreadPoolExecutor(
+            max_workers=HANDLER_WORKERS,
+            thread_name_prefix="redis-handler"
+        )
+        self.dispatch_thread = threading.Thread(
+            target=self._drain_messages,
+            daemon=True
+        )
+        self.dispatch_thread.start()
         
-        # Start listener thread
         self.subscriber_thread = threading.Thread(
             target=self._listen_for_messages,
             daemon=True
@@ -161,26 +499,113 @@ class RedisManager:
         self.subscriber_thread.start()
     
     def _listen_for_messages(self):
-        """Listen for messages on subscribed channels"""
+        """Poll subscribed channels and queue messages until closed"""
         try:
-            for message in self.pubsub.listen():
-                if message['type'] == 'message':
-                    channel = message['channel']
-                    data = json.loads(message['data'])
-                    
-                    # Call handlers for this channel
-                    if channel in self.message_handlers:
-                        for handler in self.message_handlers[channel]:
-                            try:
-                                handler(data)
-                            except Exception as e:
-                                logger.error(
-                                    "message_handler_error",
-                                    channel=channel,
-                                    error=str(e)
-                                )
+            # A bounded get_message() lets health checks run on idle
+            # connections and lets close() stop the loop within a second
+            while self.is_connected and not self._stop.is_set():
+                message = self.pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0
+                )
+                if not message or message['type'] != 'message':
+                    continue
+                
+                channel = message['channel'].decode()
+                try:
+                    data = self._unpack(message['data'])
+                except Exception as e:
+                    # Skip the bad payload rather than end the listener
+                    logger.error("message_decode_error", channel=channel, error=str(e))
+                    continue
+                try:
+                    self._msg_queue.put_nowait((channel, data))
+                except queue.Full:
+                    logger.warning("message_dropped", channel=channel, reason="queue_full")
         except Exception as e:
-            logger.error("subscriber_thread_error", error=str(e))
+            if not self._stop.is_set():
+                logger.error("subscriber_thread_error", error=str(e))
+    
+    def _drain_messages(self):
+        """Hand queued messages to the worker pool in per-channel batches"""
+        while not self._stop.is_set():
+            try:
+                first = self._msg_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            batch = [first]
+            while len(batch) < DISPATCH_BATCH_SIZE:
+                try:
+                    batch.append(self._msg_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Channels run concurrently, but each channel has at most one
+            # worker at a time so its messages are handled in order
+            by_channel = defaultdict(list)
+            for channel, data in batch:
+                by_channel[channel].append(data)
+            with self._channel_lock:
+                for channel, messages in by_channel.items():
+                    self._channel_pending[channel].extend(messages)
+                    if channel not in self._channel_running:
+                        self._channel_running.add(channel)
+                        self._worker_pool.submit(self._drain_channel, channel)
+    
+    def _drain_channel(self, channel: str):
+        """Dispatch a channel's pending messages until none are left"""
+        while True:
+            with self._channel_lock:
+                pending = self._channel_pending[channel]
+                if not pending:
+                    self._channel_running.discard(channel)
+                    return
+                messages = list(pending)
+                pending.clear()
+            self._dispatch(channel, messages)
+    
+    def _dispatch(self, channel: str, messages: List[Dict[str, Any]]):
+        """Run the channel's handlers over a batch of messages"""
+        for data in messages:
+            data = self._resolve_reference(data)
+            if data is None:
+                continue
+            
+            # Call handlers for this channel
+            for handler in self.message_handlers.get(channel, []):
+                try:
+                    handler(data)
+                except Exception as e:
+                    logger.error(
+                        "message_handler_error",
+                        channel=channel,
+                        error=str(e)
+                    )
+    
+    def decode_payload(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Decode a raw pub/sub payload, following by-reference bodies
+        
+        Args:
+            raw: Message data as received from Redis
+            
+        Returns:
+            Message dictionary, or None if a referenced body has expired
+        """
+        return self._resolve_reference(self._unpack(raw))
+    
+    def _resolve_reference(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Replace a by-reference message with its stored body"""
+        if 'ref' not in data:
+            return data
+        
+        # The key is left to expire since other subscribers may still need it
+        body = self.client.get(data['ref'])
+        if body is None:
+            logger.warning("payload_ref_expired", ref=data['ref'])
+            return None
+        return self._unpack(body)
     
     def test_pubsub(self) -> bool:
         """Test Redis pub/sub functionality"""
@@ -188,7 +613,7 @@ class RedisManager:
         test_message = {
             "type": "test",
             "message": "Testing Redis pub/sub",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()
         }
         
         received = []
@@ -234,13 +659,55 @@ class RedisManager:
         return self.publish_message(RedisChannels.FACTION_DISCOVERED, message)
     
     def publish_unit_extracted(self, unit_data: Dict[str, Any]):
-        """Publish unit extracted message"""
+        """Append a unit extracted message to the units stream"""
         message = {
             "type": MessageTypes.UNIT_EXTRACTED,
             "version": "10th",
             "data": unit_data
         }
-        return self.publish_message(RedisChannels.UNIT_EXTRACTED, message)
+        return self.publish_stream(RedisChannels.UNIT_EXTRACTED, [message])
+    
+    def publish_factions_discovered(self, factions: List[Dict[str, Any]]):
+        """Publish a faction discovered message per faction in one round trip"""
+        messages = [
+            {
+                "type": MessageTypes.FACTION_DISCOVERED,
+                "version": "10th",
+                "data": faction_data
+            }
+            for faction_data in factions
+        ]
+        return self.publish_batch(RedisChannels.FACTION_DISCOVERED, messages)
+    
+    def publish_units_extracted(self, units: List[Dict[str, Any]]):
+        """Append a unit extracted message per unit in one round trip"""
+        messages = [
+            {
+                "type": MessageTypes.UNIT_EXTRACTED,
+                "version": "10th",
+                "data": unit_data
+            }
+            for unit_data in units
+        ]
+        return self.publish_stream(RedisChannels.UNIT_EXTRACTED, messages)
+    
+    def publish_units_batch(self, batch: UnitsBatch):
+        """
+        Publish many units as a single column-wise message
+        
+        Unit keys are sent once per batch instead of once per unit;
+        subscribers read the lists in step to rebuild each unit.
+        
+        Args:
+            batch: Parallel name/faction/points lists (see to_units_batch)
+        """
+        message = {
+            "type": MessageTypes.UNITS_BATCH,
+            "version": "10th",
+            "count": len(batch["names"]),
+            "data": batch
+        }
+        return self.publish_stream(RedisChannels.UNIT_EXTRACTED, [message])
     
     def publish_scraping_status(self, status: str, details: Dict[str, Any] = None):
         """Publish scraping status update"""
@@ -259,18 +726,55 @@ class RedisManager:
         channel = channel_map.get(status, RedisChannels.SCRAPING_STARTED)
         return self.publish_message(channel, message)
     
+    def publish_and_read_recent(self, channel: str, message: Dict[str, Any],
+                                limit: int = 10) -> List[Dict]:
+        """
+        Publish a message and read back the channel's recent list in the
+        same round trip (the message itself comes first)
+        
+        Args:
+            channel: Channel name to publish to
+            message: Message dictionary to publish
+            limit: Number of recent messages to return
+            
+        Returns:
+            Recent messages, newest first (empty if the publish failed)
+        """
+        try:
+            if not self.client:
+                raise RuntimeError("Redis not initialized")
+            
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_publish(pipe, channel, [message])
+            pipe.lrange(f"messages:{channel}:recent", 0, limit - 1)
+            return [self._unpack(msg) for msg in pipe.execute()[-1]]
+            
+        except Exception as e:
+            logger.error(
+                "publish_failed",
+                channel=channel,
+                error=str(e)
+            )
+            return []
+    
     def get_recent_messages(self, channel: str, limit: int = 10) -> List[Dict]:
         """Get recent messages from a channel (for debugging)"""
         try:
             key = f"messages:{channel}:recent"
             messages = self.client.lrange(key, 0, limit - 1)
-            return [json.loads(msg) for msg in messages]
+            return [self._unpack(msg) for msg in messages]
         except Exception as e:
             logger.error("get_recent_messages_failed", error=str(e))
             return []
     
     def close(self):
         """Close Redis connections"""
+        self._stop.set()
+        for thread in (self.subscriber_thread, self.dispatch_thread):
+            if thread and thread is not threading.current_thread():
+                thread.join(timeout=2)
+        if self._worker_pool:
+            self._worker_pool.shutdown(wait=False, cancel_futures=True)
         if self.pubsub:
             self.pubsub.close()
         if self.client:
@@ -2,13 +2,49 @@
 """
 Version Repository for database operations related to game versions
 """
-from typing import Optional, Dict, Any
+import time
+import threading
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy import text
 from src.database import db_manager
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Snapshots change at most once per deploy, so reuse them briefly; major
+# version ids never change once the row exists
+SNAPSHOT_CACHE_TTL = 60
+_snapshot_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_major_version_cache: Dict[str, int] = {}
+_cache_lock = threading.Lock()
+
+# Statements are built once; SQLAlchemy caches their compiled form and
+# psycopg prepares them server-side
+VERSION_SNAPSHOT_QUERY = text("""
+    SELECT
+        vs.id as snapshot_id,
+        vs.effective_date,
+        vs.is_current,
+        wmv.id as major_version_id,
+        wmv.version_number,
+        wmv.name as major_version_name,
+        wmv.release_date
+    FROM warhammer_major_versions wmv
+    LEFT JOIN version_snapshots vs ON vs.major_version_id = wmv.id
+    WHERE wmv.version_number = :version_id
+    AND vs.is_current = TRUE
+    LIMIT 1
+""")
+
+GET_OR_CREATE_VERSION_QUERY = text("""
+    INSERT INTO warhammer_major_versions 
+    (version_number, name, release_date, is_current)
+    VALUES (:version_id, :name, CURRENT_DATE, TRUE)
+    ON CONFLICT (version_number) 
+    DO UPDATE SET version_number = EXCLUDED.version_number
+    RETURNING id
+""")
+
 
 class VersionRepository:
     """
@@ -31,7 +67,33 @@ class VersionRepository:
         if not db_manager.engine:
             db_manager.initialize()
 
+    @staticmethod
+    def invalidate_cache():
+        """Forget cached snapshots and major version ids."""
+        with _cache_lock:
+            _snapshot_cache.clear()
+            _major_version_cache.clear()
+
     def get_version_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the current version snapshot, cached for SNAPSHOT_CACHE_TTL seconds.
+
+        Returns:
+            Dictionary with snapshot data or None if not found
+        """
+        with _cache_lock:
+            cached = _snapshot_cache.get(self.version_id)
+        if cached and time.monotonic() - cached[0] < SNAPSHOT_CACHE_TTL:
+            return dict(cached[1])
+
+        snapshot = self._query_version_snapshot()
+        if snapshot:
+            with _cache_lock:
+                _snapshot_cache[self.version_id] = (time.monotonic(), snapshot)
+            return dict(snapshot)
+        return None
+
+    def _query_version_snapshot(self) -> Optional[Dict[str, Any]]:
         """
         Get the current version snapshot from database.
 
@@ -40,24 +102,8 @@ class VersionRepository:
         """
         try:
             with db_manager.engine.connect() as conn:
-                query = text("""
-                    SELECT
-                        vs.id as snapshot_id,
-                        vs.effective_date,
-                        vs.is_current,
-                        wmv.id as major_version_id,
-                        wmv.version_number,
-                        wmv.name as major_version_name,
-                        wmv.release_date
-                    FROM warhammer_major_versions wmv
-                    LEFT JOIN version_snapshots vs ON vs.major_version_id = wmv.id
-                    WHERE wmv.version_number = :version_id
-                    AND vs.is_current = TRUE
-                    LIMIT 1
-                """)
-
                 result = conn.execute(
-                        query,
+                        VERSION_SNAPSHOT_QUERY,
                         {"version_id": self.version_id}
                         ).first()
 
@@ -83,6 +129,24 @@ class VersionRepository:
             return None
 
     def get_or_create_version(self) -> Optional[int]:
+        """
+        Get or create the major version, cached once known.
+
+        Returns:
+            major_version_id or None if failed
+        """
+        with _cache_lock:
+            major_version_id = _major_version_cache.get(self.version_id)
+        if major_version_id is not None:
+            return major_version_id
+
+        major_version_id = self._query_or_create_version()
+        if major_version_id is not None:
+            with _cache_lock:
+                _major_version_cache[self.version_id] = major_version_id
+        return major_version_id
+
+    def _query_or_create_version(self) -> Optional[int]:
         """
         Get or create the major version in database.
 
@@ -90,39 +154,18 @@ class VersionRepository:
             major_version_id or None if failed
         """
         try:
-            with db_manager.engine.connect() as conn:
-                # First try to get existing
-                query = text("""
-                    SELECT id FROM warhammer_major_versions 
-                    WHERE version_number = :version_id
-                """)
-
-                result = conn.execute(
-                        query,
-                        {"version_id": self.version_id}
-                        ).first()
-
-                if result:
-                    return result.id
-
-                # Create if doesn't exist
-                insert_query = text("""
-                    INSERT INTO warhammer_major_versions 
-                    (version_number, name, release_date, is_current)
-                    VALUES (:version_id, :name, CURRENT_DATE, TRUE)
-                    RETURNING id
-                """)
-
-                result = conn.execute(
-                        insert_query,
+            # One statement: insert the row, or lock the existing one with a
+            # no-op update. Unlike DO NOTHING, the conflict branch returns the
+            # id even when a concurrent insert of the same version committed
+            # after this statement's snapshot; begin() commits on exit
+            with db_manager.engine.begin() as conn:
+                return conn.execute(
+                        GET_OR_CREATE_VERSION_QUERY,
                         {
                             "version_id": self.version_id,
                             "name": f"{self.version_id} Edition"
                             }
-                        )
-                conn.commit()
-
-                return result.scalar()
+                        ).scalar()
 
         except Exception as e:
             logger.error("failed_to_get_or_create_version", error=str(e))
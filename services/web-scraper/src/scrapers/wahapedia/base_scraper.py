@@ -1,28 +1,40 @@
 # services/web-scraper/src/scrapers/wahapedia/base_scraper.py
 
+import os
 import time
 import random
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterator
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.parser import HTMLParser
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import logging
-import sys
-import os
 
-# Add the src directory to Python path
-# When running in Docker, we're at /app, so src is at /app/src
-sys.path.insert(0, '/app/src')
+from src.config import settings
+from src.utils.logging import get_logger
+
+# On-disk HTTP cache shared by all scrapers; pages are revalidated after a day
+HTTP_CACHE_PATH = os.path.join(settings.data_dir, 'http_cache', 'wahapedia')
+HTTP_CACHE_EXPIRE = 86400
+
+# Pages with a larger (decoded) body are refused rather than parsed
+MAX_PAGE_BYTES = 20 * 1024 * 1024
 
-# Now we can import from utils
-from utils.logging import get_logger
 
 class BaseScraper:
     """Base scraper class with rate limiting, session management, and error handling."""
 
     BASE_URL = "https://wahapedia.ru"
 
+    # Subclasses without __slots__ still get a __dict__ for their own state
+    __slots__ = (
+        'logger', 'rate_limit_min', 'rate_limit_max', 'session',
+        '_bucket_lock', '_next_ok'
+    )
+
     def __init__(self, rate_limit_min: float = 2.0, rate_limit_max: float = 3.0):
         """
         Initialize the base scraper with session and rate limiting.
@@ -34,7 +46,11 @@ class BaseScraper:
         self.logger = get_logger(self.__class__.__name__)
         self.rate_limit_min = rate_limit_min
         self.rate_limit_max = rate_limit_max
-        self.last_request_time = 0
+
+        # Token bucket shared by every thread using this scraper: each request
+        # reserves the next slot, a random min-max delay after the previous one
+        self._bucket_lock = threading.Lock()
+        self._next_ok = time.monotonic()
 
         # Create session with retry strategy
         self.session = self._create_session()
@@ -45,145 +61,241 @@ class BaseScraper:
             })
 
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry logic."""
-        session = requests.Session()
+        """Create a caching requests session with retry logic."""
+        # Honours Cache-Control/ETag from the site and serves the stored copy
+        # if the site errors after expiry
+        session = requests_cache.CachedSession(
+                cache_name=HTTP_CACHE_PATH,
+                backend='sqlite',
+                expire_after=HTTP_CACHE_EXPIRE,
+                stale_if_error=True,
+                cache_control=True
+                )
 
         # Configure retry strategy
         retry_strategy = Retry(
                 total=3,
                 backoff_factor=1,
+                backoff_jitter=0.5,
+                respect_retry_after_header=True,
                 status_forcelist=[429, 500, 502, 503, 504],
                 allowed_methods=["HEAD", "GET", "OPTIONS"]
                 )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Keep a pool of warm connections so repeated fetches reuse TCP/TLS
+        adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=32,
+                pool_maxsize=32
+                )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
-        return session
-
-    def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-
-        # Calculate random delay between min and max
-        delay = random.uniform(self.rate_limit_min, self.rate_limit_max)
+        # Ask for compressed bodies (brotli is decoded when installed)
+        session.headers.update({
+            'Accept-Encoding': 'gzip, br, deflate',
+            'Connection': 'keep-alive'
+            })
 
-        if time_since_last_request < delay:
-            sleep_time = delay - time_since_last_request
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
+        return session
 
-        self.last_request_time = time.time()
+    def _absolute(self, url: str) -> str:
+        """Resolve a site-relative URL against BASE_URL."""
+        if url.startswith(('http://', 'https://')):
+            return url
+        return f"{self.BASE_URL}{url}"
 
-    def fetch_page(self, url: str, timeout: int = 30) -> Optional[str]:
+    def _rate_limit(self):
+        """Enforce rate limiting between requests (safe across threads)."""
+        with self._bucket_lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_ok - now)
+            self._next_ok = max(now, self._next_ok) + random.uniform(
+                    self.rate_limit_min, self.rate_limit_max
+                    )
+
+        # Sleep outside the lock so other workers can reserve their slots
+        if wait > 0:
+            self.logger.debug(f"Rate limiting: sleeping for {wait:.2f} seconds")
+            time.sleep(wait)
+
+    def _get(self, url: str, timeout: int = 30) -> Optional[requests.Response]:
         """
-        Fetch a page with rate limiting and error handling.
+        Issue a GET with rate limiting and error handling.
 
         Args:
             url: URL to fetch (can be relative or absolute)
             timeout: Request timeout in seconds
 
         Returns:
-            HTML content as string, or None if failed
+            Response object, or None if failed
         """
-        # Convert relative URLs to absolute
-        if not url.startswith('http'):
-            url = f"{self.BASE_URL}{url}"
-
-        # Apply rate limiting
-        self._rate_limit()
+        url = self._absolute(url)
 
         try:
-            self.logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=timeout)
+            # A fresh copy in the HTTP cache doesn't touch the site, so it
+            # skips the rate limit; a miss (504 Not Cached) or an expired
+            # copy goes out to the site (conditionally, where possible)
+            response = self.session.get(url, timeout=timeout, only_if_cached=True)
+            if not response.ok or response.is_expired:
+                self._rate_limit()
+                self.logger.info(f"Fetching: {url}")
+                response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
 
-            self.logger.debug(f"Successfully fetched {len(response.content)} bytes")
-            return response.text
+            # Measure the decoded body: Content-Length is absent on chunked
+            # responses and gives the compressed size on gzip/brotli ones
+            size = len(response.content)
+            if size > MAX_PAGE_BYTES:
+                self.logger.error(
+                        f"Refusing {url}: {size} bytes exceeds MAX_PAGE_BYTES"
+                        )
+                # Evict it so later calls don't re-read it from the cache
+                self.session.cache.delete(response.cache_key)
+                return None
+
+            self.logger.debug(
+                    f"Successfully fetched {size} bytes "
+                    f"(from_cache={response.from_cache})"
+                    )
+            return response
 
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching {url}: {str(e)}")
             return None
 
-    def parse_html(self, html: str) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str, timeout: int = 30) -> Optional[str]:
+        """
+        Fetch a page with rate limiting and error handling.
+
+        Args:
+            url: URL to fetch (can be relative or absolute)
+            timeout: Request timeout in seconds
+
+        Returns:
+            HTML content as string, or None if failed
+        """
+        response = self._get(url, timeout=timeout)
+        if response is not None:
+            return response.text
+        return None
+
+    def parse_html(self, html: str, strainer: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         Parse HTML content into BeautifulSoup object.
 
         Args:
             html: HTML content as string
+            strainer: Optional SoupStrainer; only matching elements are built
 
         Returns:
             BeautifulSoup object, or None if parsing failed
         """
         try:
-            return BeautifulSoup(html, 'html.parser')
+            return BeautifulSoup(html, 'lxml', parse_only=strainer)
         except Exception as e:
             self.logger.error(f"Error parsing HTML: {str(e)}")
             return None
 
-    def fetch_and_parse(self, url: str) -> Optional[BeautifulSoup]:
+    def parse_fast(self, html) -> Optional[HTMLParser]:
         """
-        Convenience method to fetch and parse in one step.
+        Parse HTML with selectolax (lexbor) for read-only extraction.
 
         Args:
-            url: URL to fetch
+            html: HTML content as str or bytes
 
         Returns:
-            BeautifulSoup object, or None if failed
+            selectolax HTMLParser tree, or None if parsing failed
         """
-        html = self.fetch_page(url)
-        if html:
-            return self.parse_html(html)
-        return None
+        try:
+            return HTMLParser(html)
+        except Exception as e:
+            self.logger.error(f"Error parsing HTML: {str(e)}")
+            return None
 
-    def safe_extract_text(self, element, default: str = "") -> str:
+    def parse(self, html: str, strainer: Optional[SoupStrainer] = None):
         """
-        Safely extract text from a BeautifulSoup element.
+        Parse HTML with the backend chosen by the HTML_PARSER setting.
+        selectolax (lexbor) is much faster but returns an HTMLParser tree
+        instead of BeautifulSoup, and ignores the strainer.
 
         Args:
-            element: BeautifulSoup element
-            default: Default value if element is None
+            html: HTML content as string
+            strainer: Optional SoupStrainer for the bs4 backend
 
         Returns:
-            Extracted text or default value
+            BeautifulSoup or selectolax HTMLParser, or None if parsing failed
         """
-        if element:
-            return element.get_text(strip=True)
-        return default
+        if settings.html_parser == 'selectolax':
+            return self.parse_fast(html)
+        return self.parse_html(html, strainer=strainer)
 
-    def safe_extract_attribute(self, element, attribute: str, default: str = "") -> str:
+    def fetch_and_parse(self, url: str, strainer: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
-        Safely extract an attribute from a BeautifulSoup element.
+        Convenience method to fetch and parse in one step.
 
         Args:
-            element: BeautifulSoup element
-            attribute: Attribute name to extract
-            default: Default value if element or attribute is None
+            url: URL to fetch
+            strainer: Optional SoupStrainer passed through to parse_html
 
         Returns:
-            Attribute value or default
+            Parsed page (see parse), or None if failed
         """
-        if element:
-            return element.get(attribute, default)
-        return default
+        response = self._get(url)
+        if response is None:
+            return None
 
-    def simulate_hover(self, soup: BeautifulSoup, element_selector: str) -> bool:
+        # Every caller gets its own tree; the HTTP cache already saves the fetch
+        return self.parse(response.text, strainer=strainer)
+
+    def fetch_many(
+            self,
+            urls: List[str],
+            max_workers: int = 4,
+            strainer: Optional[SoupStrainer] = None
+            ) -> List[Optional[BeautifulSoup]]:
         """
-        Simulate hover effect for dropdown menus.
-        Note: Wahapedia's dropdowns are CSS-based, so we just need to find
-        the dropdown content that's normally hidden.
+        Fetch and parse several pages concurrently.
+        Workers share this scraper's token bucket, so the request rate is
+        unchanged; only time spent waiting on the network overlaps.
 
         Args:
-            soup: BeautifulSoup object
-            element_selector: CSS selector for the element to "hover"
+            urls: URLs to fetch (relative or absolute)
+            max_workers: Number of concurrent fetches
+            strainer: Optional SoupStrainer passed through to parse_html
 
         Returns:
-            True if hover element found, False otherwise
+            BeautifulSoup objects in the same order as urls (None where failed)
+        """
+        return list(self.iter_many(urls, max_workers=max_workers, strainer=strainer))
+
+    def iter_many(
+            self,
+            urls: List[str],
+            max_workers: int = 4,
+            strainer: Optional[SoupStrainer] = None
+            ) -> Iterator[Optional[BeautifulSoup]]:
         """
-        hover_element = soup.select_one(element_selector)
-        if hover_element:
-            self.logger.debug(f"Found hover element: {element_selector}")
-            return True
-        return False
+        Like fetch_many, but yield each page as soon as it and every page
+        before it are ready, so callers can start work before the last fetch.
+
+        Args:
+            urls: URLs to fetch (relative or absolute)
+            max_workers: Number of concurrent fetches
+            strainer: Optional SoupStrainer passed through to parse_html
+
+        Yields:
+            BeautifulSoup objects in the same order as urls (None where failed)
+        """
+        if not urls:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            yield from executor.map(
+                lambda url: self.fetch_and_parse(url, strainer=strainer),
+                urls
+                )
+        finally:
+            # A consumer that stops early doesn't wait on pages it won't read
+            executor.shutdown(wait=False, cancel_futures=True)
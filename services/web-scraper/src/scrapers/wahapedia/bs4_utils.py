@@ -0,0 +1,65 @@
+# services/web-scraper/src/scrapers/wahapedia/bs4_utils.py
+
+"""
+BeautifulSoup helpers shared by the Wahapedia extractors.
+Plain functions so the per-element hot paths skip method dispatch.
+"""
+
+from bs4 import BeautifulSoup
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def safe_extract_text(element, default: str = "") -> str:
+    """
+    Safely extract text from a BeautifulSoup element.
+
+    Args:
+        element: BeautifulSoup element
+        default: Default value if element is None
+
+    Returns:
+        Extracted text or default value
+    """
+    if element:
+        return element.get_text(strip=True)
+    return default
+
+
+def safe_extract_attribute(element, attribute: str, default: str = "") -> str:
+    """
+    Safely extract an attribute from a BeautifulSoup element.
+
+    Args:
+        element: BeautifulSoup element
+        attribute: Attribute name to extract
+        default: Default value if element or attribute is None
+
+    Returns:
+        Attribute value or default
+    """
+    if element:
+        return element.get(attribute, default)
+    return default
+
+
+def simulate_hover(soup: BeautifulSoup, element_selector: str) -> bool:
+    """
+    Simulate hover effect for dropdown menus.
+    Note: Wahapedia's dropdowns are CSS-based, so we just need to find
+    the dropdown content that's normally hidden.
+
+    Args:
+        soup: BeautifulSoup object
+        element_selector: CSS selector for the element to "hover"
+
+    Returns:
+        True if hover element found, False otherwise
+    """
+    hover_element = soup.select_one(element_selector)
+    if hover_element:
+        logger.debug(f"Found hover element: {element_selector}")
+        return True
+    return False
@@ -3,14 +3,23 @@
 """
 CSS selectors and patterns for Wahapedia scraping.
 Centralized location for all selectors to make maintenance easier.
+
+Selector dicts hold plain CSS strings, which selectolax takes directly.
+Sets queried through BeautifulSoup also get a soupsieve-compiled copy
+(``*_SOUP_SELECTORS``), so bs4 call sites use ``[key].select_one(soup)``
+and skip re-parsing the CSS on every lookup.
 """
 
+import soupsieve as sv
+
 # Navigation and Faction List Selectors
 FACTION_SELECTORS = {
     'nav_button': '.NavBtn_Factions',
     'dropdown_content': '.NavDropdown-content',
     'faction_items': '.BreakInsideAvoid',
     'faction_link': '.BreakInsideAvoid a',
+    # First dropdown following the nav button (replaces a Python sibling walk)
+    'faction_dropdown': '.NavBtn_Factions ~ .NavDropdown-content',
 }
 
 # Army Rules Selectors (for Phase 2)
@@ -19,6 +28,8 @@ ARMY_RULE_SELECTORS = {
     'columns_container': '.Columns2',
     'break_inside_avoid': '.BreakInsideAvoid',
     'rule_name': 'h3',
+    'rule_name_fallback': 'h2',
+    'break_div': 'div.BreakInsideAvoid',
 }
 
 # Detachment Selectors (for Phase 3) 
@@ -39,11 +50,20 @@ UNIT_SELECTORS = {
     'unit_header': '.dsH2Header',
     'unit_name': '.dsH2Header > div',
     'price_tag': '.PriceTag',
-    'wargear_header': 'div:contains("WARGEAR OPTIONS")',
+    'wargear_header': 'div:-soup-contains("WARGEAR OPTIONS")',
     'wargear_list': 'ul',
     'wargear_item': 'li',
 }
 
+
+def _compile(selectors):
+    """Compile every selector string in a dict into a SoupSieve object."""
+    return {key: sv.compile(pattern) for key, pattern in selectors.items()}
+
+
+# Army rules are extracted on either backend; the bs4 path uses these
+ARMY_RULE_SOUP_SELECTORS = _compile(ARMY_RULE_SELECTORS)
+
 # URLs
 URLS = {
     'quick_start': '/wh40k10ed/the-rules/quick-start-guide/',
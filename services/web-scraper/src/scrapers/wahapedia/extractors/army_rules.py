@@ -1,32 +1,74 @@
 # services/web-scraper/src/scrapers/wahapedia/extractors/army_rules.py
 
-import sys
-sys.path.insert(0, '/app/src/scrapers/wahapedia')
-sys.path.insert(0, '/app/src/publishers')
-
-from typing import List, Dict, Optional
-import json
-from base_scraper import BaseScraper
-from css_selectors import ARMY_RULE_SELECTORS
-from scraper_publisher import ScraperPublisher
-from redis_client import redis_manager
+import os
+from typing import List, Dict, Optional, Iterator
+import orjson
+from bs4 import Tag
+from src.scrapers.wahapedia.base_scraper import BaseScraper
+from src.scrapers.wahapedia.bs4_utils import safe_extract_text
+from src.scrapers.wahapedia.css_selectors import (
+    ARMY_RULE_SELECTORS, ARMY_RULE_SOUP_SELECTORS
+)
+from src.publishers.scraper_publisher import get_publisher
+from src.redis_client import redis_manager
+from src.config import settings
+
+# Army rules per pub/sub message; keeps each message small and lets
+# consumers start on the first chunk while later pages still download
+ARMY_RULES_CHUNK_SIZE = 8
+
+
+def _select_one(node, key: str):
+    """Run an ARMY_RULE_SELECTORS entry on a BeautifulSoup or selectolax node."""
+    if isinstance(node, Tag):
+        return ARMY_RULE_SOUP_SELECTORS[key].select_one(node)
+    return node.css_first(ARMY_RULE_SELECTORS[key])
+
+
+def _following_divs(node) -> Iterator:
+    """Lazily yield the div siblings after a BeautifulSoup or selectolax node."""
+    if isinstance(node, Tag):
+        yield from node.find_next_siblings('div')
+        return
+    sibling = node.next
+    while sibling is not None:
+        if sibling.tag == 'div':
+            yield sibling
+        sibling = sibling.next
+
+
+def _classes(node) -> List[str]:
+    """CSS classes of a BeautifulSoup or selectolax node."""
+    if isinstance(node, Tag):
+        return node.get('class', [])
+    return (node.attributes.get('class') or '').split()
+
+
+def _text(node) -> str:
+    """Stripped text of a BeautifulSoup or selectolax node."""
+    if isinstance(node, Tag):
+        return safe_extract_text(node)
+    return node.text(strip=True)
 
 class ArmyRulesExtractor(BaseScraper):
     """Extractor for getting army rules for each faction."""
 
-    def __init__(self, publish_to_redis: bool = True):
+    def __init__(self, publish_to_redis: bool = True, retain_in_memory: bool = False):
         """
         Initialize the army rules extractor.
 
         Args:
             publish_to_redis: Whether to publish results to Redis
+            retain_in_memory: Whether extract_all_army_rules also keeps results
+                in self.army_rules; opt in when calling save_to_json
         """
         super().__init__()
         self.army_rules = []
         self.publish_to_redis = publish_to_redis
+        self.retain_in_memory = retain_in_memory
 
         if self.publish_to_redis:
-            self.publisher = ScraperPublisher()
+            self.publisher = get_publisher()
 
     def extract_army_rule_for_faction(self, faction_data: Dict[str, str]) -> Optional[Dict[str, str]]:
         """
@@ -40,67 +82,78 @@ class ArmyRulesExtractor(BaseScraper):
         """
         faction_name = faction_data.get('name')
         faction_url = faction_data.get('url')
-        faction_code = faction_data.get('code')
 
         if not faction_url:
             self.logger.error(f"No URL for faction {faction_name}")
             return None
 
-        self.logger.info(f"Extracting army rule for {faction_name}")
-
         # Fetch the faction page
         soup = self.fetch_and_parse(faction_url)
+        return self._extract_army_rule_from_page(faction_data, soup)
+
+    def _extract_army_rule_from_page(self, faction_data: Dict[str, str], soup) -> Optional[Dict[str, str]]:
+        """
+        Extract army rule from an already fetched faction page.
 
-        if not soup:
+        Args:
+            faction_data: Dictionary with faction name, url, and code
+            soup: Parsed faction page (BeautifulSoup or selectolax, see
+                BaseScraper.parse), or None if the fetch failed
+
+        Returns:
+            Dictionary with faction info and army rule, or None if failed
+        """
+        faction_name = faction_data.get('name')
+        faction_url = faction_data.get('url')
+        faction_code = faction_data.get('code')
+
+        self.logger.info(f"Extracting army rule for {faction_name}")
+
+        if soup is None:
             self.logger.error(f"Failed to fetch page for {faction_name}")
             return None
 
         # Find the Army Rules anchor
-        army_rules_anchor = soup.find('a', {'name': 'Army-Rules'})
+        army_rules_anchor = _select_one(soup, 'army_rules_anchor')
 
-        if not army_rules_anchor:
+        if army_rules_anchor is None:
             self.logger.warning(f"No Army Rules anchor found for {faction_name}")
             return None
 
-        target = army_rules_anchor
-        # Try to find the next Columns2 div after the anchor
-        for sibling in target.find_next_siblings():
-            if sibling.name == 'div' and 'Columns2' in sibling.get('class', []):
+        # One walk over the anchor's siblings: stop at the first Columns2 div,
+        # remembering the first BreakInsideAvoid div passed on the way
+        target = None
+        break_div = None
+        for sibling in _following_divs(army_rules_anchor):
+            classes = _classes(sibling)
+            if 'Columns2' in classes:
                 target = sibling
                 break
+            if break_div is None and 'BreakInsideAvoid' in classes:
+                break_div = sibling
 
-        if target == army_rules_anchor:
+        if target is None:
             self.logger.warning(f"No Columns2 div found after Army Rules anchor for {faction_name} switching to BreakInsideAvoid directly")
-            # Find the BreakInsideAvoid div
-            break_div = None
-            for sibling in target.find_next_siblings():
-                if sibling.name == 'div' and 'BreakInsideAvoid' in sibling.get('class', []):
-                    break_div = sibling
-                    break
-
-            if not break_div:
-                self.logger.warning(f"No BreakInsideAvoid div found for {faction_name}")
-                return None
         else:
-            break_div = target.find('div', {'class': 'BreakInsideAvoid'})
+            break_div = _select_one(target, 'break_div')
 
-            if not break_div:
-                self.logger.warning(f"No BreakInsideAvoid div found for {faction_name}")
-                return None
+        if break_div is None:
+            self.logger.warning(f"No BreakInsideAvoid div found for {faction_name}")
+            return None
 
         # Army name
         # Find the first h3 tag
-        army_rule_header = break_div.find('h3')
+        army_rule_header = _select_one(break_div, 'rule_name')
 
-        if not army_rule_header:
+        if army_rule_header is None:
             self.logger.warning(f"No h3 tag found in army rules section for {faction_name}")
-            army_rule_header = break_div.find('h2')
+            army_rule_header = _select_one(break_div, 'rule_name_fallback')
 
-            if not army_rule_header:
+            if army_rule_header is None:
                 self.logger.warning(f"No h2 tag found in army rules section for {faction_name}")
                 return None
 
-        army_rule_name = self.safe_extract_text(army_rule_header)
+        army_rule_name = _text(army_rule_header)
 
         if army_rule_name:
             result = {
@@ -125,55 +178,130 @@ class ArmyRulesExtractor(BaseScraper):
         Returns:
             List of dictionaries with faction info and army rules
         """
+        army_rules = list(self.iter_army_rules(factions))
+
+        if self.retain_in_memory:
+            self.army_rules.extend(army_rules)
+
+        return army_rules
+
+    def iter_army_rules(self, factions: List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Yield army rules as faction pages are parsed, publishing them to
+        Redis in chunks of ARMY_RULES_CHUNK_SIZE when enabled.
+
+        Args:
+            factions: List of faction dictionaries from faction_list extractor
+
+        Yields:
+            Dictionaries with faction info and army rule
+
+        The final status is 'completed' once every faction has been read,
+        'stopped' if the consumer closes the generator first, and 'error'
+        if reading a page raises.
+        """
         self.logger.info(f"Starting army rules extraction for {len(factions)} factions")
 
         if self.publish_to_redis:
             self.publisher.publish_status('started', {'task': 'army_rules_extraction'})
 
-        for faction in factions:
-            army_rule_data = self.extract_army_rule_for_faction(faction)
+        # Pages arrive in order while later ones are still downloading; the
+        # shared rate limit still spaces the requests
+        pages = self.iter_many(
+                [f['url'] for f in factions if f.get('url')],
+                max_workers=settings.scraper_workers
+                )
 
-            if army_rule_data:
-                self.army_rules.append(army_rule_data)
-            else:
-                self.logger.warning(f"Failed to extract army rule for {faction.get('name')}")
-
-        self.logger.info(f"Successfully extracted {len(self.army_rules)} army rules")
+        chunk = []
+        count = 0
+        published = True
+        outcome = 'completed'
+        error = None
 
-        # Publish to Redis if enabled
-        if self.publish_to_redis and self.army_rules:
-            self.publish_army_rules()
+        try:
+            for faction in factions:
+                if faction.get('url'):
+                    army_rule_data = self._extract_army_rule_from_page(faction, next(pages))
+                else:
+                    self.logger.error(f"No URL for faction {faction.get('name')}")
+                    army_rule_data = None
+
+                if not army_rule_data:
+                    self.logger.warning(f"Failed to extract army rule for {faction.get('name')}")
+                    continue
+
+                count += 1
+                if self.publish_to_redis:
+                    chunk.append(army_rule_data)
+                yield army_rule_data
+
+                if len(chunk) >= ARMY_RULES_CHUNK_SIZE:
+                    published = self.publish_army_rules_chunk(chunk) and published
+                    chunk = []
+        except GeneratorExit:
+            outcome = 'stopped'
+            raise
+        except BaseException as e:
+            outcome = 'error'
+            error = str(e) or type(e).__name__
+            raise
+        finally:
+            # Runs even if the consumer stops early or closes the generator,
+            # so the rules already yielded and the final status still go out
+            if outcome == 'error':
+                self.logger.error(f"Army rules extraction failed after {count} rules: {error}")
+            else:
+                self.logger.info(f"Successfully extracted {count} army rules")
+
+            if self.publish_to_redis:
+                if chunk:
+                    published = self.publish_army_rules_chunk(chunk) and published
+
+                if outcome == 'error':
+                    self.publisher.publish_status('error', {
+                        'task': 'army_rules_extraction',
+                        'error': error,
+                        'rules_count': count
+                    })
+                elif not published:
+                    self.publisher.publish_status('error', {
+                        'task': 'army_rules_extraction',
+                        'error': 'Failed to publish to Redis'
+                    })
+                elif count:
+                    self.publisher.publish_status(outcome, {
+                        'task': 'army_rules_extraction',
+                        'rules_count': count
+                    })
+
+            # Drop fetches for pages nobody will read
+            pages.close()
+
+    def publish_army_rules_chunk(self, chunk: List[Dict[str, str]]) -> bool:
+        """
+        Publish a chunk of army rules to Redis.
 
-        return self.army_rules
+        Args:
+            chunk: Army rule dictionaries to send in one message
 
-    def publish_army_rules(self):
-        """Publish army rules to Redis."""
+        Returns:
+            True if successful, False otherwise
+        """
         try:
             message = {
-                'type': 'army_rules',
-                'count': len(self.army_rules),
-                'data': self.army_rules
+                'type': 'army_rules_chunk',
+                'count': len(chunk),
+                'data': chunk
             }
 
-            # Use redis_manager directly instead of self.publisher.redis_manager
-            success = redis_manager.publish_message(
+            return redis_manager.publish_message(
                 'wahapedia:army_rules',
                 message
             )
 
-            if success:
-                self.publisher.publish_status('completed', {
-                    'task': 'army_rules_extraction',
-                    'rules_count': len(self.army_rules)
-                })
-            else:
-                self.publisher.publish_status('error', {
-                    'task': 'army_rules_extraction',
-                    'error': 'Failed to publish to Redis'
-                })
-
         except Exception as e:
             self.logger.error(f"Error publishing army rules: {str(e)}")
+            return False
 
     def save_to_json(self, filename: str = 'army_rules.json'):
         """
@@ -187,8 +315,13 @@ class ArmyRulesExtractor(BaseScraper):
             return
 
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.army_rules, f, indent=2)
+            # Write to a temp file and rename so a crash never leaves a
+            # truncated file behind
+            data = orjson.dumps(self.army_rules, option=orjson.OPT_INDENT_2)
+            tmp_filename = f"{filename}.tmp"
+            with open(tmp_filename, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_filename, filename)
             self.logger.info(f"Saved {len(self.army_rules)} army rules to {filename}")
         except Exception as e:
             self.logger.error(f"Error saving to JSON: {str(e)}")
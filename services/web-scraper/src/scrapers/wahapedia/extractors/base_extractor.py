@@ -1,17 +1,19 @@
 # services/web-scraper/src/scrapers/wahapedia/extractors/base_extractor.py
 
 from typing import Optional
-from services.wahapedia.url_config import WahapediaURLConfig
-from scrapers.wahapedia.base_scraper import BaseScraper
+from src.services.wahapedia.url_config import WahapediaURLConfig
+from src.scrapers.wahapedia.base_scraper import BaseScraper
 
 class BaseExtractor(BaseScraper):
     """Base extractor with URL configuration support."""
 
-    def __init__(self, version_id: str = "10th", publish_to_redis: bool = True):
+    def __init__(self, version_id: str = "10th", publish_to_redis: bool = True,
+                 url_config: Optional[WahapediaURLConfig] = None):
         super().__init__()
-        self.url_config = WahapediaURLConfig(version_id)
+        # Services pass their own config so extractors build the same versioned URLs
+        self.url_config = url_config or WahapediaURLConfig(version_id)
         self.publish_to_redis = publish_to_redis
-        self.version_id = version_id
+        self.version_id = self.url_config.version_id
 
     def get_url_for_faction(self, faction_code: str) -> str:
         """Get versioned URL for faction."""
@@ -1,32 +1,37 @@
 # services/web-scraper/src/scrapers/wahapedia/extractors/faction_list.py
 
-import sys
-sys.path.insert(0, '/app/src/scrapers/wahapedia')
-sys.path.insert(0, '/app/src/publishers')
-
+import os
+import time
 from typing import List, Dict, Optional
-import json
-from base_scraper import BaseScraper
-from css_selectors import FACTION_SELECTORS, URLS
-from scraper_publisher import ScraperPublisher
-from base_extractor import BaseExtractor
+import orjson
+from src.scrapers.wahapedia.css_selectors import FACTION_SELECTORS
+from src.publishers.scraper_publisher import get_publisher
+from src.scrapers.wahapedia.extractors.base_extractor import BaseExtractor
+from src.services.wahapedia.url_config import WahapediaURLConfig
+
+# Local copy of the faction list reused by get_factions while fresh; one
+# file per edition so configs for different editions never share a list
+FACTIONS_CACHE_FILE = '/app/output/factions_{version_id}.json'
+FACTIONS_CACHE_MAX_AGE = 86400
+
 
 class FactionListExtractor(BaseExtractor):
     """Extractor for getting all faction names and URLs from Wahapedia."""
 
-    def __init__(self, publish_to_redis: bool = True):
+    def __init__(self, publish_to_redis: bool = True,
+                 url_config: Optional[WahapediaURLConfig] = None):
         """
         Initialize the faction list extractor.
 
         Args:
             publish_to_redis: Whether to publish results to Redis
+            url_config: Versioned URL config (defaults to the 10th edition)
         """
-        super().__init__()
+        super().__init__(publish_to_redis=publish_to_redis, url_config=url_config)
         self.factions = []
-        self.publish_to_redis = publish_to_redis
 
         if self.publish_to_redis:
-            self.publisher = ScraperPublisher()
+            self.publisher = get_publisher()
 
     def extract_factions(self) -> List[Dict[str, str]]:
         """
@@ -41,10 +46,12 @@ class FactionListExtractor(BaseExtractor):
         if self.publish_to_redis:
             self.publisher.publish_status('started', {'task': 'faction_extraction'})
 
-        # Fetch the quick start page which has the faction dropdown
-        soup = self.fetch_and_parse(URLS['quick_start'])
+        # Fetch the quick start page which has the faction dropdown.
+        # Only a few nodes are read from it, so parse with selectolax (lexbor)
+        # rather than building a full BeautifulSoup tree
+        html = self.fetch_page(self.url_config.get_quick_start_url())
 
-        if not soup:
+        if not html:
             self.logger.error("Failed to fetch quick start page")
             if self.publish_to_redis:
                 self.publisher.publish_status('error', {
@@ -54,7 +61,10 @@ class FactionListExtractor(BaseExtractor):
             return []
 
         # Find the faction navigation button
-        faction_btn = soup.select_one(FACTION_SELECTORS['nav_button'])
+        tree = self.parse_fast(html)
+        faction_btn = None
+        if tree is not None:
+            faction_btn = tree.css_first(FACTION_SELECTORS['nav_button'])
 
         if not faction_btn:
             self.logger.error("Could not find faction navigation button")
@@ -66,15 +76,9 @@ class FactionListExtractor(BaseExtractor):
             return []
 
         # The dropdown content is actually present in the HTML,
-        # just hidden by CSS until hover
-        # We need to find it relative to the nav button
-
-        # Find the dropdown content (it's a sibling)
-        dropdown = None
-        for sibling in faction_btn.find_next_siblings():
-            if 'NavDropdown-content' in sibling.get('class', []):
-                dropdown = sibling
-                break
+        # just hidden by CSS until hover. It's a later sibling of the nav
+        # button, so let the selector engine find it in one pass
+        dropdown = tree.css_first(FACTION_SELECTORS['faction_dropdown'])
 
         if not dropdown:
             self.logger.error("Could not find faction dropdown content")
@@ -88,21 +92,20 @@ class FactionListExtractor(BaseExtractor):
         self.logger.info("Found faction dropdown content")
 
         # Extract all faction links
-        faction_links = dropdown.select(FACTION_SELECTORS['faction_link'])
+        faction_links = dropdown.css(FACTION_SELECTORS['faction_link'])
 
         self.logger.info(f"Found {len(faction_links)} factions")
 
         for link in faction_links:
-            faction_name = self.safe_extract_text(link)
-            faction_url = self.safe_extract_attribute(link, 'href')
+            faction_name = link.text(strip=True)
+            faction_url = link.attributes.get('href')
 
             if faction_name and faction_url:
                 # Clean up the faction name (remove any extra whitespace)
                 faction_name = faction_name.strip()
 
                 # Convert relative URL to absolute if needed
-                if not faction_url.startswith('http'):
-                    faction_url = f"{self.BASE_URL}{faction_url}"
+                faction_url = self._absolute(faction_url)
 
                 faction_data = {
                         'name': faction_name,
@@ -131,6 +134,60 @@ class FactionListExtractor(BaseExtractor):
 
         return self.factions
 
+    def get_factions(self, cache_file: Optional[str] = None,
+                     max_age: int = FACTIONS_CACHE_MAX_AGE) -> List[Dict[str, str]]:
+        """
+        Get factions from a recent scrape if available, otherwise extract them.
+        Checks the list stored in Redis by the publisher, then a fresh
+        cache_file, before falling back to extract_factions(). Either copy is
+        only used if its URLs belong to this extractor's edition.
+
+        Args:
+            cache_file: JSON file written by save_to_json (defaults to
+                FACTIONS_CACHE_FILE for this edition)
+            max_age: Seconds a cached file stays fresh
+
+        Returns:
+            List of dictionaries containing faction name and URL
+        """
+        cache_file = cache_file or FACTIONS_CACHE_FILE.format(version_id=self.version_id)
+
+        if self.publish_to_redis:
+            factions = self.publisher.get_stored_factions()
+            if factions and self._is_this_edition(factions):
+                self.logger.info(f"Loaded {len(factions)} factions from Redis")
+                self.factions = factions
+                return self.factions
+
+        try:
+            if time.time() - os.path.getmtime(cache_file) < max_age:
+                with open(cache_file, 'rb') as f:
+                    factions = orjson.loads(f.read())
+                if self._is_this_edition(factions):
+                    self.factions = factions
+                    self.logger.info(f"Loaded {len(self.factions)} factions from {cache_file}")
+                    return self.factions
+        except (OSError, orjson.JSONDecodeError):
+            pass
+
+        factions = self.extract_factions()
+        if factions:
+            self.save_to_json(cache_file)
+        return factions
+
+    def _is_this_edition(self, factions: List[Dict[str, str]]) -> bool:
+        """
+        Check that cached factions were scraped for this extractor's edition.
+
+        Args:
+            factions: Faction dictionaries from a cache
+
+        Returns:
+            True if every faction URL is under this edition's path
+        """
+        edition_path = f"/{self.url_config.url_path}/"
+        return all(edition_path in faction.get('url', '') for faction in factions)
+
     def _extract_faction_code(self, url: str) -> str:
         """
         Extract faction code from URL.
@@ -142,11 +199,10 @@ class FactionListExtractor(BaseExtractor):
         Returns:
             Faction code string
         """
-        parts = url.rstrip('/').split('/')
-        if 'factions' in parts:
-            faction_index = parts.index('factions')
-            if faction_index + 1 < len(parts):
-                return parts[faction_index + 1]
+        # Only the last two segments matter: .../factions/<code>
+        tail = url.rstrip('/').rsplit('/', 2)
+        if len(tail) >= 2 and tail[-2] == 'factions':
+            return tail[-1]
         return ""
 
     def save_to_json(self, filename: str = 'factions.json'):
@@ -161,8 +217,13 @@ class FactionListExtractor(BaseExtractor):
             return
 
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.factions, f, indent=2)
+            # Write to a temp file and rename so a crash never leaves a
+            # truncated file behind
+            data = orjson.dumps(self.factions, option=orjson.OPT_INDENT_2)
+            tmp_filename = f"{filename}.tmp"
+            with open(tmp_filename, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_filename, filename)
             self.logger.info(f"Saved {len(self.factions)} factions to {filename}")
         except Exception as e:
             self.logger.error(f"Error saving to JSON: {str(e)}")
@@ -1,9 +1,6 @@
 # services/web-scraper/src/scrapers/wahapedia/test_base.py
 
-import sys
-sys.path.insert(0, '/app/src/scrapers/wahapedia')
-
-from base_scraper import BaseScraper
+from src.scrapers.wahapedia.base_scraper import BaseScraper
 import time
 
 def test_basic_connection():
@@ -45,13 +42,13 @@ def test_rate_limiting():
     scraper = BaseScraper(rate_limit_min=2.0, rate_limit_max=3.0)
 
     print("\nTesting rate limiting (should take 2-3 seconds)...")
-    start = time.time()
+    start = time.monotonic()
 
     # Make two requests
     scraper.fetch_page("/wh40k10ed/the-rules/quick-start-guide/")
     scraper.fetch_page("/wh40k10ed/the-rules/quick-start-guide/")
 
-    elapsed = time.time() - start
+    elapsed = time.monotonic() - start
     print(f"✓ Two requests took {elapsed:.2f} seconds")
 
     if elapsed >= 2.0:
@@ -1,12 +1,17 @@
 # services/web-scraper/src/scrapers/wahapedia/test_base_simple.py
 
-import sys
-sys.path.insert(0, '/app/src')
-
 # Create a minimal test without using the logging module
 import time
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.parser import HTMLParser
+
+# Pages declaring a larger body are not downloaded
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+
+# One keep-alive session for every request in this script
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=3))
 
 def test_basic_fetch():
     """Test basic fetching without the full scraper class."""
@@ -15,22 +20,38 @@ def test_basic_fetch():
     url = "https://wahapedia.ru/wh40k10ed/the-rules/quick-start-guide/"
     
     try:
-        # Simple fetch
-        response = requests.get(url, timeout=30)
+        # Stream the body so an oversized page is rejected from its headers
+        response = SESSION.get(url, timeout=30, stream=True)
         response.raise_for_status()
+        if int(response.headers.get('content-length', 0)) > MAX_PAGE_BYTES:
+            response.close()
+            print(f"✗ Page larger than {MAX_PAGE_BYTES} bytes, skipped")
+            return
+        # Chunked and compressed bodies have no usable Content-Length, so
+        # stop reading as soon as the running total passes the cap
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(65536):
+            size += len(chunk)
+            if size > MAX_PAGE_BYTES:
+                response.close()
+                print(f"✗ Page larger than {MAX_PAGE_BYTES} bytes, skipped")
+                return
+            chunks.append(chunk)
+        body = b"".join(chunks)
         
         print(f"✓ Successfully fetched page")
         print(f"  Status code: {response.status_code}")
-        print(f"  Page size: {len(response.content)} bytes")
+        print(f"  Page size: {len(body)} bytes")
         
-        # Try to parse
-        soup = BeautifulSoup(response.text, 'html.parser')
-        title = soup.find('title')
+        # Try to parse (selectolax only reads, so no BeautifulSoup tree)
+        tree = HTMLParser(body)
+        title = tree.css_first('title')
         if title:
-            print(f"  Page title: {title.text.strip()}")
+            print(f"  Page title: {title.text(strip=True)}")
             
         # Look for faction dropdown
-        faction_btn = soup.select_one('.NavBtn_Factions')
+        faction_btn = tree.css_first('.NavBtn_Factions')
         if faction_btn:
             print("✓ Found faction navigation button")
         else:
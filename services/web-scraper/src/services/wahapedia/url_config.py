@@ -4,10 +4,9 @@ Wahapedia URL Configuration
 Maps generic version IDs to Wahapedia-specific URL patterns
 """
 
-import sys
-sys.path.insert(0, "/app/src")
-
-from typing import Dict, Optional, List, Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Optional, List, Set, Tuple
 from urllib.parse import urlencode, quote
 import re
 from src.utils.logging import get_logger
@@ -15,21 +14,61 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+# Built URLs keyed on (base URL, pattern, sorted parameters); least recently
+# used evicted so a long-running scraper keeps a bounded cache
+URL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _cached_build(base_url: str, pattern: str, params: Tuple[Tuple[str, str], ...]) -> str:
+    """Fill a URL pattern; raises KeyError (never cached) for a missing parameter."""
+    return f"{base_url}{pattern.format_map(dict(params))}"
+
+
+# Slugs of free-form faction names, reused across every URL built for them
+SLUG_CACHE_SIZE = 256
+_NON_SLUG_RE = re.compile(r'[^a-z0-9\-]')
+_MULTI_HYPHEN_RE = re.compile(r'-+')
+
+
+@lru_cache(maxsize=SLUG_CACHE_SIZE)
+def _slugify(faction_input: str) -> str:
+    """Lowercase a faction name and reduce it to hyphen-separated [a-z0-9]."""
+    normalized = faction_input.lower()
+
+    # Handle special characters
+    normalized = normalized.replace("'", "-")
+    normalized = normalized.replace("'", "-")  # Handle smart quotes
+    normalized = normalized.replace(" ", "-")
+    normalized = _NON_SLUG_RE.sub('', normalized)
+    normalized = _MULTI_HYPHEN_RE.sub('-', normalized)  # Remove multiple hyphens
+    return normalized.strip('-')
+
+
 class WahapediaURLConfig:
     """
     Manages URL patterns for Wahapedia based on game version.
     Translates generic version IDs to Wahapedia URL structures.
     """
 
+    # Fixed attribute layout; the registries below stay class-level
+    __slots__ = (
+            'version_id', 'url_path', 'validate_urls', '_section_cache',
+            'quick_start_url', 'army_lists_url', '_extractor_static_urls'
+            )
+
     # Map generic version IDs to Wahapedia URL paths
-    VERSION_URL_MAPPING = {
+    VERSION_URL_MAPPING = MappingProxyType({
             "10th": "wh40k10ed",
             "9th": "wh40k9ed",
             "8th": "wh40k8ed",
-            }
+            })
 
     BASE_URL = "https://wahapedia.ru"
 
+    # Pattern used per URL built, compiled once
+    _PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
     # Comprehensive URL pattern registry
     URL_PATTERNS = {
             # Navigation/Base Pages
@@ -56,7 +95,7 @@ class WahapediaURLConfig:
             }
 
     # Section anchor mappings for different page sections
-    SECTION_ANCHORS = {
+    SECTION_ANCHORS = MappingProxyType({
             'army_rules': 'Army-Rules',
             'detachments': 'Detachment-Rules',
             'detachment_rule': 'Detachment-Rule',  # Some factions use singular
@@ -69,7 +108,7 @@ class WahapediaURLConfig:
             'faction_keywords': 'Faction-Keywords',
             'damaged': 'Damaged',
             'invulnerable_save': 'Invulnerable-Save',
-            }
+            })
 
     # Mapping extractors to their required URL patterns
     EXTRACTOR_URL_MAPPING = {
@@ -83,7 +122,7 @@ class WahapediaURLConfig:
             }
 
     # Known faction code transformations
-    FACTION_CODE_MAPPINGS = {
+    FACTION_CODE_MAPPINGS = MappingProxyType({
             "T'au Empire": "t-au-empire",
             "Emperor's Children": "emperor-s-children",
             "Adepta Sororitas": "adepta-sororitas",
@@ -109,7 +148,10 @@ class WahapediaURLConfig:
             "Orks": "orks",
             "Tyranids": "tyranids",
             "Unaligned Forces": "unaligned-forces",
-            }
+            })
+
+    # Every known code, built once for membership checks
+    _VALID_FACTION_CODES = frozenset(FACTION_CODE_MAPPINGS.values())
 
     def __init__(self, version_id: str, validate_urls: bool = False):
         """
@@ -125,7 +167,28 @@ class WahapediaURLConfig:
                 "wh40k10ed"  # Default to 10th
                 )
         self.validate_urls = validate_urls
-        self._url_cache = {}  # Cache for constructed URLs
+        # (faction code, section) -> URL with anchor; only known factions and
+        # sections are stored, so it is bounded by factions x sections
+        self._section_cache: Dict[Tuple[str, str], str] = {}
+
+        # Fixed per version, so built once and read as plain attributes
+        self.quick_start_url = (
+                self.build_url('quick_start')
+                or f"{self.BASE_URL}/{self.url_path}/the-rules/quick-start-guide/"
+                )
+        self.army_lists_url = (
+                self.build_url('army_lists')
+                or f"{self.BASE_URL}/{self.url_path}/army-lists/"
+                )
+
+        # Concrete URLs for extractor patterns that need no faction
+        self._extractor_static_urls: Dict[str, List[str]] = {
+                name: [
+                    self.build_url(pattern) for pattern in patterns
+                    if '{faction_code}' not in self.URL_PATTERNS[pattern]
+                    ]
+                for name, patterns in self.EXTRACTOR_URL_MAPPING.items()
+                }
 
         logger.debug(
                 "wahapedia_url_config_initialized",
@@ -154,14 +217,9 @@ class WahapediaURLConfig:
             Constructed URL or None if pattern not found
         """
         if pattern_name not in self.URL_PATTERNS:
-            logger.warning(f"Unknown URL pattern: {pattern_name}")
+            logger.warning("unknown_url_pattern", pattern=pattern_name)
             return None
 
-        # Check cache
-        cache_key = f"{pattern_name}:{kwargs}"
-        if cache_key in self._url_cache:
-            return self._url_cache[cache_key]
-
         pattern = self.URL_PATTERNS[pattern_name]
 
         # Always add version
@@ -173,28 +231,18 @@ class WahapediaURLConfig:
 
         # Build the URL
         try:
-            # Replace placeholders
-            url_path = pattern
-            for key, value in kwargs.items():
-                placeholder = f"{{{key}}}"
-                if placeholder in url_path:
-                    url_path = url_path.replace(placeholder, str(value))
-
-            # Check for any remaining placeholders
-            if '{' in url_path and '}' in url_path:
-                missing = re.findall(r'\{(\w+)\}', url_path)
-                logger.warning(f"Missing parameters for {pattern_name}: {missing}")
-                return None
-
-            full_url = f"{self.BASE_URL}{url_path}"
-
-            # Cache the result
-            self._url_cache[cache_key] = full_url
-
-            return full_url
+            return _cached_build(self.BASE_URL, pattern, tuple(sorted(kwargs.items())))
+
+        except KeyError:
+            missing = [
+                    name for name in self._PLACEHOLDER_RE.findall(pattern)
+                    if name not in kwargs
+                    ]
+            logger.warning("missing_url_parameters", pattern=pattern_name, missing=missing)
+            return None
 
         except Exception as e:
-            logger.error(f"Error building URL for {pattern_name}: {e}")
+            logger.error("url_build_failed", pattern=pattern_name, error=str(e))
             return None
 
     def get_faction_section_url(self, faction_code: str, section: str) -> Optional[str]:
@@ -208,6 +256,14 @@ class WahapediaURLConfig:
         Returns:
             Full URL with section anchor
         """
+        # Names and codes for the same faction share one entry
+        if faction_code:
+            faction_code = self.normalize_faction_code(faction_code)
+        key = (faction_code, section)
+        cached = self._section_cache.get(key)
+        if cached is not None:
+            return cached
+
         # Build base faction URL
         base_url = self.build_url('faction_main', faction_code=faction_code)
         if not base_url:
@@ -216,15 +272,18 @@ class WahapediaURLConfig:
         # Get section anchor
         anchor = self.SECTION_ANCHORS.get(section)
         if not anchor:
-            logger.warning(f"Unknown section: {section}")
+            logger.warning("unknown_section", section=section)
             # Try using the section as-is
             anchor = section
 
-        return f"{base_url}#{anchor}"
+        url = f"{base_url}#{anchor}"
+        if section in self.SECTION_ANCHORS and faction_code in self._VALID_FACTION_CODES:
+            self._section_cache[key] = url
+        return url
 
     def get_quick_start_url(self) -> str:
         """Get URL for quick start guide (has faction dropdown)."""
-        return self.build_url('quick_start') or f"{self.BASE_URL}/{self.url_path}/the-rules/quick-start-guide/"
+        return self.quick_start_url
 
     def get_faction_url(self, faction_code: str) -> str:
         """
@@ -252,7 +311,7 @@ class WahapediaURLConfig:
 
     def get_army_lists_url(self) -> str:
         """Get URL for army lists page."""
-        return self.build_url('army_lists') or f"{self.BASE_URL}/{self.url_path}/army-lists/"
+        return self.army_lists_url
 
     def get_unit_datasheet_url(self, faction_code: str, unit_slug: str) -> str:
         """
@@ -297,6 +356,10 @@ class WahapediaURLConfig:
         Returns:
             Normalized faction code for URLs
         """
+        # Known canonical code, the common case for internal callers
+        if faction_input in self._VALID_FACTION_CODES:
+            return faction_input
+
         # Check if it's a known faction name
         if faction_input in self.FACTION_CODE_MAPPINGS:
             return self.FACTION_CODE_MAPPINGS[faction_input]
@@ -306,17 +369,7 @@ class WahapediaURLConfig:
             return faction_input
 
         # Normalize: lowercase, replace spaces and special chars with hyphens
-        normalized = faction_input.lower()
-
-        # Handle special characters
-        normalized = normalized.replace("'", "-")
-        normalized = normalized.replace("'", "-")  # Handle smart quotes
-        normalized = normalized.replace(" ", "-")
-        normalized = re.sub(r'[^a-z0-9\-]', '', normalized)
-        normalized = re.sub(r'-+', '-', normalized)  # Remove multiple hyphens
-        normalized = normalized.strip('-')
-
-        return normalized
+        return _slugify(faction_input)
 
     def validate_faction_code(self, faction_code: str) -> bool:
         """
@@ -329,10 +382,7 @@ class WahapediaURLConfig:
             True if valid, False otherwise
         """
         # Check against known mappings
-        normalized = self.normalize_faction_code(faction_code)
-        valid_codes = set(self.FACTION_CODE_MAPPINGS.values())
-
-        return normalized in valid_codes
+        return self.normalize_faction_code(faction_code) in self._VALID_FACTION_CODES
 
     def get_valid_faction_codes(self) -> List[str]:
         """
@@ -341,9 +391,9 @@ class WahapediaURLConfig:
         Returns:
             List of valid faction codes
         """
-        return sorted(list(set(self.FACTION_CODE_MAPPINGS.values())))
+        return sorted(self._VALID_FACTION_CODES)
 
-    def get_urls_for_extractor(self, extractor_name: str) -> List[str]:
+    def get_url_patterns_for_extractor(self, extractor_name: str) -> List[str]:
         """
         Get URL patterns used by a specific extractor.
 
@@ -355,6 +405,18 @@ class WahapediaURLConfig:
         """
         return self.EXTRACTOR_URL_MAPPING.get(extractor_name, [])
 
+    def get_static_urls_for_extractor(self, extractor_name: str) -> List[str]:
+        """
+        Get the URLs an extractor needs that don't depend on a faction.
+
+        Args:
+            extractor_name: Name of the extractor class
+
+        Returns:
+            List of full URLs, built once per config
+        """
+        return self._extractor_static_urls.get(extractor_name, [])
+
     def get_all_section_anchors(self) -> Dict[str, str]:
         """
         Get all available section anchors.
@@ -387,9 +449,10 @@ class WahapediaURLConfig:
         return f"{base_url}{anchor}"
 
     def clear_cache(self):
-        """Clear the URL cache."""
-        self._url_cache.clear()
-        logger.debug("URL cache cleared")
+        """Clear the URL cache (shared by every WahapediaURLConfig)."""
+        _cached_build.cache_clear()
+        self._section_cache.clear()
+        logger.debug("url_cache_cleared")
 
     def get_detachments_url(self, faction_code: str) -> str:
         """Get URL for detachments section."""
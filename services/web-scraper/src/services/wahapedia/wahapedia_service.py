@@ -2,16 +2,13 @@
 """
 Wahapedia implementation of the scraper service
 """
-import sys
-sys.path.insert(0, "/app/src")
-
 from typing import List, Dict, Any, Optional
 from src.utils.logging import get_logger
 
-from core.base_scraper_service import BaseScraperService
-from scrapers.wahapedia.base_scraper import BaseScraper
-from core.scraper_context import ScraperContext
-from services.wahapedia.url_config import WahapediaURLConfig
+from src.core.base_scraper_service import BaseScraperService
+from src.scrapers.wahapedia.base_scraper import BaseScraper
+from src.core.scraper_context import ScraperContext
+from src.services.wahapedia.url_config import WahapediaURLConfig
 
 logger = get_logger(__name__)
 
@@ -21,6 +18,8 @@ class WahapediaService(BaseScraperService):
     Uses existing extractors but provides the generic interface.
     """
 
+    __slots__ = ('url_config', 'scraper', '_faction_extractor', '_army_rules_extractor')
+
     def __init__(self, context: ScraperContext):
         """
         Initialize Wahapedia service.
@@ -42,18 +41,28 @@ class WahapediaService(BaseScraperService):
                 url_path=self.url_config.get_version_path()
                 )
 
+    def _share_session(self, extractor):
+        """Point an extractor at the service's session so all fetches reuse its pool."""
+        extractor.session.close()
+        extractor.session = self.scraper.session
+        return extractor
+
     def _get_faction_extractor(self):
         """Lazy load faction extractor."""
         if not self._faction_extractor:
             from src.scrapers.wahapedia.extractors.faction_list import FactionListExtractor
-            self._faction_extractor = FactionListExtractor(publish_to_redis=False)
+            self._faction_extractor = self._share_session(
+                    FactionListExtractor(publish_to_redis=False, url_config=self.url_config)
+                    )
         return self._faction_extractor
 
     def _get_army_rules_extractor(self):
         """Lazy load army rules extractor."""
         if not self._army_rules_extractor:
             from src.scrapers.wahapedia.extractors.army_rules import ArmyRulesExtractor
-            self._army_rules_extractor = ArmyRulesExtractor(publish_to_redis=False)
+            self._army_rules_extractor = self._share_session(
+                    ArmyRulesExtractor(publish_to_redis=False)
+                    )
         return self._army_rules_extractor
 
     def get_factions(self) -> List[Dict[str, Any]]:
@@ -68,20 +77,6 @@ class WahapediaService(BaseScraperService):
         # Use existing faction extractor
         extractor = self._get_faction_extractor()
 
-        # Override the URL with our version-aware URL
-        original_url = "/wh40k10ed/the-rules/quick-start-guide/"
-        new_url = self.url_config.get_quick_start_url()
-
-        # Temporarily patch the fetch_and_parse to use our URL
-        original_fetch = extractor.fetch_and_parse
-
-        def versioned_fetch(url):
-            if url == original_url:
-                url = new_url
-            return original_fetch(url)
-
-        extractor.fetch_and_parse = versioned_fetch
-
         # Extract factions
         factions = extractor.extract_factions()
 
@@ -121,6 +116,33 @@ class WahapediaService(BaseScraperService):
 
         return result
 
+    def get_all_army_rules(self, factions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get army rules for many factions, fetching their pages concurrently.
+
+        Args:
+            factions: Faction dictionaries
+
+        Returns:
+            Army rules dictionaries for the factions that yielded one
+        """
+        valid = [faction for faction in factions if self.validate_faction_dict(faction)]
+        if len(valid) < len(factions):
+            logger.warning("invalid_faction_dicts", skipped=len(factions) - len(valid))
+
+        logger.info("getting_all_army_rules", factions=len(valid))
+
+        # iter_army_rules spreads the fetches over settings.scraper_workers
+        # threads while the scraper's rate limit still spaces the requests
+        extractor = self._get_army_rules_extractor()
+        results = []
+        for result in extractor.iter_army_rules(valid):
+            result['source'] = 'wahapedia'
+            result['version_id'] = self.version_id
+            results.append(result)
+
+        return results
+
     def get_detachments(self, faction: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Get detachments for a faction.
@@ -3,58 +3,98 @@ Comprehensive test script for verifying all service connections
 """
 import sys
 import time
-from datetime import datetime
+import logging
+import structlog
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler
 
-# Add src to path
-sys.path.insert(0, '/app')
-
-from src.config import settings
+from src.config import settings, RedisChannels, MessageTypes
 from src.utils.logging import setup_logging, get_logger
-from src.database import test_database_connection, db_manager
-from src.redis_client import test_redis_connection, redis_manager
+
+# Report lines are buffered and written in batches instead of one stdout
+# write per line; warnings and each new section header flush the buffer
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stdout is when it emits"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        # sys.stdout may be swapped (e.g. by pytest capture); never pin one
+        pass
+
+
+_out = logging.getLogger("test_connections")
+_out.setLevel(logging.INFO)
+_out.propagate = False
+_stdout_handler = _StdoutHandler()
+_stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+_out.addHandler(MemoryHandler(64, flushLevel=logging.WARNING, target=_stdout_handler))
+
+
+def _flush_output():
+    """Write out any buffered report lines"""
+    for handler in _out.handlers:
+        handler.flush()
 
 
 def print_header(message: str):
     """Print a formatted header"""
-    print("\n" + "=" * 60)
-    print(f" {message}")
-    print("=" * 60)
+    _out.info("\n" + "=" * 60)
+    _out.info(f" {message}")
+    _out.info("=" * 60)
+    # Section output from other loggers follows the header
+    _flush_output()
+
+
+# Status prefixes indexed by the success flag (False -> 0, True -> 1)
+_OK = "✅"
+_FAIL = "❌"
+_PREFIX = (_FAIL, _OK)
 
 
 def print_status(message: str, success: bool):
     """Print a status message with emoji"""
-    emoji = "✅" if success else "❌"
-    print(f"{emoji} {message}")
+    _out.info(f"{_PREFIX[success]} {message}")
+
+
+def _run_probe(name: str, probe):
+    """Run a connection probe with probe=<name> bound on its log lines"""
+    with structlog.contextvars.bound_contextvars(probe=name):
+        return probe()
 
 
 def test_environment():
     """Test environment variables are loaded correctly"""
     print_header("ENVIRONMENT CONFIGURATION")
     
-    print(f"Environment: {settings.scraper_env}")
-    print(f"Log Level: {settings.log_level}")
-    print(f"Wahapedia URL: {settings.wahapedia_base_url}")
-    print(f"Rate Limit: {settings.rate_limit_delay} seconds")
-    print()
-    print("Database Configuration:")
-    print(f"  Host: {settings.database_host}")
-    print(f"  Port: {settings.database_port}")
-    print(f"  Database: {settings.database_name}")
-    print(f"  User: {settings.database_user}")
-    print()
-    print("Redis Configuration:")
-    print(f"  Host: {settings.redis_host}")
-    print(f"  Port: {settings.redis_port}")
-    print(f"  Database: {settings.redis_db}")
+    _out.info(f"Environment: {settings.scraper_env}")
+    _out.info(f"Log Level: {settings.log_level}")
+    _out.info(f"Wahapedia URL: {settings.wahapedia_base_url}")
+    _out.info(f"Rate Limit: {settings.rate_limit_delay} seconds")
+    _out.info("")
+    _out.info("Database Configuration:")
+    _out.info(f"  Host: {settings.database_host}")
+    _out.info(f"  Port: {settings.database_port}")
+    _out.info(f"  Database: {settings.database_name}")
+    _out.info(f"  User: {settings.database_user}")
+    _out.info("")
+    _out.info("Redis Configuration:")
+    _out.info(f"  Host: {settings.redis_host}")
+    _out.info(f"  Port: {settings.redis_port}")
+    _out.info(f"  Database: {settings.redis_db}")
+    _flush_output()
     
     return True
 
 
 def main():
     """Run all connection tests"""
-    print("\n" + "🚀" * 30)
-    print(" WAHAPEDIA SCRAPER CONNECTION TEST SUITE")
-    print("🚀" * 30)
+    _out.info("\n" + "🚀" * 30)
+    _out.info(" WAHAPEDIA SCRAPER CONNECTION TEST SUITE")
+    _out.info("🚀" * 30)
     
     # Setup logging
     logger = setup_logging(
@@ -63,6 +103,10 @@ def main():
         enable_json=False
     )
     
+    # Deferred so SQLAlchemy and redis load only when the suite actually runs
+    from src.database import test_database_connection, db_manager
+    from src.redis_client import test_redis_connection, redis_manager
+    
     all_tests_passed = True
     
     # Test 1: Environment
@@ -73,27 +117,24 @@ def main():
         print_status(f"Environment test failed: {e}", False)
         all_tests_passed = False
     
-    # Test 2: Database
-    print_header("DATABASE CONNECTION TEST")
-    try:
-        db_success = test_database_connection()
-        print_status("Database test complete", db_success)
-        if not db_success:
-            all_tests_passed = False
-    except Exception as e:
-        print_status(f"Database test failed: {e}", False)
-        all_tests_passed = False
-    
-    # Test 3: Redis
-    print_header("REDIS CONNECTION TEST")
-    try:
-        redis_success = test_redis_connection()
-        print_status("Redis test complete", redis_success)
-        if not redis_success:
-            all_tests_passed = False
-    except Exception as e:
-        print_status(f"Redis test failed: {e}", False)
-        all_tests_passed = False
+    # Tests 2 and 3: Database and Redis are independent probes, so run them
+    # side by side; their log lines interleave under this header, each
+    # tagged probe=Database or probe=Redis
+    print_header("DATABASE AND REDIS CONNECTION TESTS")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        probes = [
+            ("Database", executor.submit(_run_probe, "Database", test_database_connection)),
+            ("Redis", executor.submit(_run_probe, "Redis", test_redis_connection)),
+        ]
+        for name, future in probes:
+            try:
+                success = future.result()
+                print_status(f"{name} test complete", success)
+                if not success:
+                    all_tests_passed = False
+            except Exception as e:
+                print_status(f"{name} test failed: {e}", False)
+                all_tests_passed = False
     
     # Test 4: Full Integration
     print_header("INTEGRATION TEST")
@@ -101,18 +142,24 @@ def main():
         # Publish a test message
         test_data = {
             "test": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "message": "Integration test message"
         }
         
-        redis_manager.publish_scraping_status("started", test_data)
-        time.sleep(1)
-        
-        # Check recent messages
-        recent = redis_manager.get_recent_messages("scraper:status:started", 1)
-        if recent:
+        # Publish a status update and read the recent list back in one
+        # pipeline; the LPUSH runs first, so this run's message is on top
+        recent = redis_manager.publish_and_read_recent(
+            RedisChannels.SCRAPING_STARTED,
+            {
+                "type": MessageTypes.STATUS_UPDATE,
+                "status": "started",
+                "details": test_data
+            },
+            limit=1
+        )
+        if recent and recent[0].get('details', {}).get('timestamp') == test_data["timestamp"]:
             print_status("Integration test passed", True)
-            print(f"  Last message: {recent[0].get('details', {}).get('message', 'N/A')}")
+            _out.info(f"  Last message: {recent[0].get('details', {}).get('message', 'N/A')}")
         else:
             print_status("Integration test - no messages found", False)
             all_tests_passed = False
@@ -124,14 +171,16 @@ def main():
     # Final Summary
     print_header("TEST SUMMARY")
     if all_tests_passed:
-        print("🎉 All tests passed! Your scraper is ready to run.")
+        _out.info("🎉 All tests passed! Your scraper is ready to run.")
     else:
-        print("⚠️  Some tests failed. Please check the logs above.")
+        _out.warning("⚠️  Some tests failed. Please check the logs above.")
         sys.exit(1)
     
-    # Cleanup
-    db_manager.close()
-    redis_manager.close()
+    # Cleanup: close both connections at once rather than one after the other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for future in [executor.submit(db_manager.close), executor.submit(redis_manager.close)]:
+            future.result()
+    _flush_output()
 
 
 if __name__ == "__main__":
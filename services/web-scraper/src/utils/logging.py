@@ -4,11 +4,132 @@ Logging configuration for Wahapedia Scraper Service
 """
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
+import orjson
 import structlog
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+# Drains queued records into the console/file handlers on its own thread
+_listener: QueueListener = None
+
+
+def _stop_listener():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def _orjson_dumps(obj, default=None, **kw) -> str:
+    """json.dumps-compatible serializer for JSONRenderer, backed by orjson"""
+    # stdlib handlers write text, so hand back str rather than bytes
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Processor chains, built once: JSON for production, human-readable for development
+# filter_by_level stays first so dropped records skip the rest of the chain;
+# merge_contextvars adds keys bound with bind_contextvars/LogContext
+_COMMON_PROCESSORS = (
+    structlog.stdlib.filter_by_level,
+    structlog.contextvars.merge_contextvars,
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+)
+_JSON_PROCESSORS = _COMMON_PROCESSORS + (
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+)
+_DEV_PROCESSORS = _COMMON_PROCESSORS + (
+    structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.dev.ConsoleRenderer(colors=True),
+)
+
+# Arguments of the setup_logging call currently in effect; a repeat call
+# with the same ones returns without rebuilding anything
+_configured_with: tuple = None
+
+# Chatty library loggers held at WARNING. Logger level checks run before a
+# record is built, so their DEBUG/INFO calls cost no allocation; they keep
+# propagating so their warnings and errors still reach our handlers
+_NOISY_LOGGERS = ("urllib3", "requests", "requests_cache", "sqlalchemy.engine")
+
+# Log directories already created by this process
+_created_dirs: set = set()
+
+# Bytes buffered by the main log file before a write() syscall
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that lets records collect in a 64KiB file buffer
+    instead of flushing after each one. ERROR and above still flush at once;
+    rollover and close flush the rest. The file size is tracked here because
+    asking a text stream for tell() would flush it on every record.
+    """
+
+    def _open(self):
+        stream = open(
+            self.baseFilename, self.mode, buffering=LOG_FILE_BUFFER_SIZE,
+            encoding=self.encoding, errors=self.errors
+        )
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # Count encoded bytes, not characters: emoji and ✓ take several
+            size = len(msg.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+            if self.maxBytes > 0 and self._size and self._size + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += size
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that reuses the asctime text within the same second, so busy
+    logs pay for one strftime per second instead of one per record.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted text), swapped as one tuple
+        self._cached_second = (None, None)
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, text = self._cached_second
+        if second != cached_second:
+            text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_second = (second, text)
+        return self.default_msec_format % (text, record.msecs)
 
 
 def setup_logging(
@@ -26,14 +147,21 @@ def setup_logging(
         service_name: Name of the service for log identification
         enable_json: Whether to output logs in JSON format
     """
+    global _configured_with
+    config = (log_level, log_dir, service_name, enable_json)
+    if _configured_with == config:
+        return structlog.get_logger(service_name)
     
-    # Create log directory if it doesn't exist
-    Path(log_dir).mkdir(parents=True, exist_ok=True)
+    # Create log directory if it doesn't exist (once per directory)
+    if log_dir not in _created_dirs:
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(log_dir)
     
     # Configure standard library logging
     log_level_obj = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Remove existing handlers
+    # Remove existing handlers (and drain a listener from an earlier call)
+    _stop_listener()
     logging.root.handlers = []
     
     # Console handler with color support for development
@@ -45,7 +173,7 @@ def setup_logging(
     error_file = os.path.join(log_dir, f"{service_name}.error.log")
     
     # Rotating file handler for all logs
-    file_handler = RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         info_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
@@ -61,53 +189,35 @@ def setup_logging(
     error_handler.setLevel(logging.ERROR)
     
     # Format configuration
-    if enable_json:
-        # JSON format for production
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.processors.JSONRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            cache_logger_on_first_use=True,
-        )
-    else:
-        # Human-readable format for development
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.dev.ConsoleRenderer(colors=True)
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            cache_logger_on_first_use=True,
-        )
+    structlog.configure(
+        # structlog keeps its own list, so the module tuples never change
+        processors=list(_JSON_PROCESSORS if enable_json else _DEV_PROCESSORS),
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
     
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level_obj,
-        handlers=[console_handler, file_handler, error_handler],
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Configure root logger: callers only enqueue records, and one listener
+    # thread does the formatting and the stdout/file writes
+    formatter = CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in (console_handler, file_handler, error_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    logging.root.addHandler(QueueHandler(log_queue))
+    logging.root.setLevel(log_level_obj)
+
+    global _listener
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
     )
+    _listener.start()
+    _configured_with = config
     
     # Suppress noisy libraries
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    for name in _NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
     
     return structlog.get_logger(service_name)
 
@@ -138,8 +248,11 @@ class LogContext:
         return self.logger
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Restores each var to its value before __enter__, so keys an outer
+        # LogContext bound are put back rather than dropped
         if self.token:
-            structlog.contextvars.unbind_contextvars(*self.context.keys())
+            structlog.contextvars.reset_contextvars(**self.token)
+            self.token = None
 
 
 class ScrapeLogger:
@@ -148,49 +261,64 @@ class ScrapeLogger:
     def __init__(self, logger=None):
         self.logger = logger or get_logger("scraper")
         self.start_time = None
-        self.stats = {
-            "items_processed": 0,
-            "items_failed": 0,
-            "items_skipped": 0
+        # Monotonic start for durations; start_time is the wall-clock start
+        self._t0 = None
+        # Plain int counters on the per-item path; stats builds the dict
+        self.n_ok = self.n_fail = self.n_skip = 0
+        # Event names per (outcome, item type), built on first use only
+        self._events = {}
+    
+    @property
+    def stats(self) -> dict:
+        """Counters for the current scrape"""
+        return {
+            "items_processed": self.n_ok,
+            "items_failed": self.n_fail,
+            "items_skipped": self.n_skip
         }
     
+    def _event(self, outcome: str, item_type: str) -> str:
+        """Cached event name such as processed_unit"""
+        key = (outcome, item_type)
+        event = self._events.get(key)
+        if event is None:
+            event = self._events[key] = f"{outcome}_{item_type}"
+        return event
+    
     def start_scrape(self, target: str, scrape_type: str = "full"):
         """Log scrape start"""
         self.start_time = datetime.now()
-        self.stats = {
-            "items_processed": 0,
-            "items_failed": 0,
-            "items_skipped": 0
-        }
+        self._t0 = time.monotonic()
+        self.n_ok = self.n_fail = self.n_skip = 0
         self.logger.info(
             "scrape_started",
             target=target,
-            scrape_type=scrape_type,
-            timestamp=self.start_time.isoformat()
+            scrape_type=scrape_type
         )
     
     def item_processed(self, item_type: str, item_name: str, success: bool = True):
         """Log item processing"""
         if success:
-            self.stats["items_processed"] += 1
-            self.logger.debug(f"processed_{item_type}", name=item_name)
+            self.n_ok += 1
+            self.logger.debug(self._event("processed", item_type), name=item_name)
         else:
-            self.stats["items_failed"] += 1
-            self.logger.warning(f"failed_{item_type}", name=item_name)
+            self.n_fail += 1
+            self.logger.warning(self._event("failed", item_type), name=item_name)
     
     def item_skipped(self, item_type: str, item_name: str, reason: str):
         """Log skipped item"""
-        self.stats["items_skipped"] += 1
-        self.logger.debug(f"skipped_{item_type}", name=item_name, reason=reason)
+        self.n_skip += 1
+        self.logger.debug(self._event("skipped", item_type), name=item_name, reason=reason)
     
     def end_scrape(self, success: bool = True):
         """Log scrape completion"""
-        duration = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
+        duration = time.monotonic() - self._t0 if self._t0 is not None else 0
         
+        stats = self.stats
         self.logger.info(
             "scrape_completed" if success else "scrape_failed",
             duration_seconds=duration,
-            **self.stats
+            **stats
         )
         
-        return self.stats
+        return stats
@@ -2,8 +2,6 @@
 """
 Minimal test to verify the architecture works
 """
-import sys
-sys.path.insert(0, "/app/src")
 
 print("Creating minimal architecture test...")
 
@@ -0,0 +1,34 @@
+# services/web-scraper/tests/_report.py
+"""
+Buffered report output for the script-style test suites.
+
+Report lines are collected and written to stdout once per test section
+instead of one write per line.
+"""
+import sys
+import functools
+
+_buf = []
+
+
+def emit(*parts, sep=" ", end="\n"):
+    """Queue a report line (print-compatible signature)"""
+    _buf.append(sep.join(str(part) for part in parts) + end)
+
+
+def flush():
+    """Write queued report lines in one stdout write"""
+    if _buf:
+        sys.stdout.write("".join(_buf))
+        _buf.clear()
+
+
+def flushes(test):
+    """Flush the report buffer when a test section finishes"""
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        try:
+            return test(*args, **kwargs)
+        finally:
+            flush()
+    return wrapper
@@ -0,0 +1,15 @@
+# services/web-scraper/tests/conftest.py
+"""
+Shared pytest setup for the web-scraper tests.
+
+Puts the service root on sys.path once for the whole session so every
+test module can use ``src.*`` imports without inserting its own entry.
+"""
+import os
+import sys
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SERVICE_ROOT not in sys.path:
+    sys.path.insert(0, SERVICE_ROOT)
+
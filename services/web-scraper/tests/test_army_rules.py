@@ -1,11 +1,9 @@
 # services/web-scraper/tests/test_army_rules.py
 
 import sys
-sys.path.insert(0, '/app/src/scrapers/wahapedia')
-sys.path.insert(0, '/app/src/scrapers/wahapedia/extractors')
 
-from faction_list import FactionListExtractor
-from army_rules import ArmyRulesExtractor
+from src.scrapers.wahapedia.extractors.faction_list import FactionListExtractor
+from src.scrapers.wahapedia.extractors.army_rules import ArmyRulesExtractor
 import json
 
 def test_single_faction_army_rule():
@@ -45,7 +43,7 @@ def test_all_factions_army_rules(limit=None):
     # First get all factions
     print("Getting faction list...")
     faction_extractor = FactionListExtractor()
-    factions = faction_extractor.extract_factions()
+    factions = faction_extractor.get_factions()
 
     if not factions:
         print("✗ Failed to get faction list")
@@ -64,7 +62,7 @@ def test_all_factions_army_rules(limit=None):
 
     # Extract army rules
     print("\nExtracting army rules...")
-    army_rules_extractor = ArmyRulesExtractor(publish_to_redis=True)
+    army_rules_extractor = ArmyRulesExtractor(publish_to_redis=True, retain_in_memory=True)
     army_rules = army_rules_extractor.extract_all_army_rules(test_factions)
 
     if army_rules:
@@ -1,10 +1,6 @@
 # services/web-scraper/tests/test_faction_list.py
 
-import sys
-sys.path.insert(0, '/app/src/scrapers/wahapedia')
-sys.path.insert(0, '/app/src/scrapers/wahapedia/extractors')
-
-from faction_list import FactionListExtractor
+from src.scrapers.wahapedia.extractors.faction_list import FactionListExtractor
 import json
 
 def test_faction_extraction():
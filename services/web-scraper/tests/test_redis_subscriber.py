@@ -1,11 +1,9 @@
 # services/web-scraper/tests/test_redis_subscriber.py
 
-import sys
-sys.path.insert(0, '/app/src')
-
-import json
 import signal
-from redis_client import redis_manager  # Use the existing redis_manager
+from datetime import datetime
+from src.config import RedisChannels
+from src.redis_client import redis_manager  # Use the existing redis_manager
 
 class TestSubscriber:
     """Test subscriber to verify Redis messages are being published correctly."""
@@ -36,7 +34,10 @@ class TestSubscriber:
                 for item in message_data['data'][:3]:
                     print(f"  - {item.get('name', 'Unknown')}: {item.get('code', 'N/A')}")
 
-            print(f"Timestamp: {message_data.get('timestamp', 'N/A')}")
+            timestamp = message_data.get('timestamp')
+            if isinstance(timestamp, int):
+                timestamp = datetime.fromtimestamp(timestamp / 1e9).isoformat()
+            print(f"Timestamp: {timestamp or 'N/A'}")
             print(f"{'='*60}")
         except Exception as e:
             print(f"Error handling message: {e}")
@@ -50,26 +51,52 @@ class TestSubscriber:
                 'wahapedia:army_rules',
                 'wahapedia:detachments',
                 'wahapedia:enhancements',
-                'wahapedia:units',
                 ]
+        # Units arrive on the stream the publisher XADDs to, read in batches
+        # through a consumer group
+        units_stream = RedisChannels.UNIT_EXTRACTED
 
-        print(f"Subscribing to channels: {', '.join(channels)}")
+        print(f"Subscribing to channels: {', '.join(channels)} (stream: {units_stream})")
 
-        # Subscribe to each channel with our handler
-        for channel in channels:
-            redis_manager.subscribe(channel, self.handle_message)
+        # One pubsub connection read from this thread, no listener thread.
+        # Subscribe confirmations are kept so get_message() only returns
+        # None once nothing is waiting
+        pubsub = redis_manager.client.pubsub()
+        pubsub.subscribe(*channels)
 
         print("\nListening for messages... (Press Ctrl+C to stop)\n")
 
         # Set up signal handler for clean shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
 
-        # Keep the main thread alive
-        import time
+        # Take every waiting pub/sub message, then block on the stream for up
+        # to half a second so Ctrl+C is noticed promptly
         while self.running:
-            time.sleep(1)
+            message = pubsub.get_message(timeout=0)
+            while message:
+                if message['type'] == 'message':
+                    message_data = redis_manager.decode_payload(message['data'])
+                    if message_data is not None:
+                        self.handle_message(message_data)
+                message = pubsub.get_message(timeout=0)
+
+            entries = redis_manager.read_stream(
+                units_stream, 'test-subscriber', 'c1', count=64, block=500)
+            for _, message_data in entries:
+                self.handle_message(message_data)
+            # Ack once handled, so entries are redelivered if this crashes
+            redis_manager.ack_stream(
+                units_stream, 'test-subscriber', [entry_id for entry_id, _ in entries])
+
+        pubsub.close()
 
     def signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully."""
         print("\n\nShutting down subscriber...")
-        sel
+        self.running = False
+
+
+if __name__ == "__main__":
+    subscriber = TestSubscriber()
+    subscriber.subscribe_and_listen()
+
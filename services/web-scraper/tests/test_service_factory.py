@@ -3,160 +3,210 @@
 Test suite for Service Factory and scraper services
 """
 import sys
-sys.path.insert(0, "/app/src")
+import functools
 
-print("Starting Service Factory Tests...")
-print("=" * 60)
+from tests._report import emit, flush, flushes
+
+emit("Starting Service Factory Tests...")
+emit("=" * 60)
 
 try:
-    from core.service_factory import ServiceFactory, get_service_factory
-    from core.base_scraper_service import BaseScraperService
-    print("✅ Successfully imported modules")
+    from src.core.service_factory import ServiceFactory, get_service_factory
+    from src.core.base_scraper_service import BaseScraperService
+    emit("✅ Successfully imported modules")
 except ImportError as e:
-    print(f"❌ Import error: {e}")
+    emit(f"❌ Import error: {e}")
+    flush()
     sys.exit(1)
+flush()
+
+@functools.cache
+def _wahapedia_service():
+    """One Wahapedia service from the factory singleton, shared by the tests"""
+    return get_service_factory().create_service("wahapedia")
 
+@flushes
 def test_service_factory_creation():
     """Test that service factory can be created."""
-    print("\n📝 Test 1: Service Factory Creation")
-    print("-" * 40)
+    emit("\n📝 Test 1: Service Factory Creation")
+    emit("-" * 40)
 
     try:
         factory = ServiceFactory()
-        print("  ✓ Factory instance created")
+        emit("  ✓ Factory instance created")
 
         services = factory.get_available_services()
-        print(f"  ✓ Available services: {services}")
+        emit(f"  ✓ Available services: {services}")
 
         if "wahapedia" in services:
-            print("  ✓ Wahapedia service is registered")
+            emit("  ✓ Wahapedia service is registered")
         else:
-            print("  ✗ Wahapedia service NOT found!")
+            emit("  ✗ Wahapedia service NOT found!")
             return False
 
-        print("  ✅ Test PASSED")
+        emit("  ✅ Test PASSED")
         return True
     except Exception as e:
-        print(f"  ❌ Test FAILED: {e}")
+        emit(f"  ❌ Test FAILED: {e}")
         return False
 
+@flushes
 def test_wahapedia_service_creation():
     """Test creating Wahapedia service."""
-    print("\n📝 Test 2: Wahapedia Service Creation")
-    print("-" * 40)
+    emit("\n📝 Test 2: Wahapedia Service Creation")
+    emit("-" * 40)
 
     try:
-        factory = get_service_factory()
-        print("  ✓ Got factory singleton")
-
-        service = factory.create_service("wahapedia")
-        print(f"  ✓ Created service: {service.__class__.__name__}")
+        service = _wahapedia_service()
+        emit(f"  ✓ Created service: {service.__class__.__name__}")
 
         if isinstance(service, BaseScraperService):
-            print("  ✓ Service is instance of BaseScraperService")
+            emit("  ✓ Service is instance of BaseScraperService")
         else:
-            print("  ✗ Service is NOT a BaseScraperService!")
+            emit("  ✗ Service is NOT a BaseScraperService!")
             return False
 
-        print(f"  ✓ Service name: {service.service_name}")
-        print(f"  ✓ Version ID: {service.version_id}")
+        emit(f"  ✓ Service name: {service.service_name}")
+        emit(f"  ✓ Version ID: {service.version_id}")
 
         if service.version_id == "10th":
-            print("  ✓ Version matches expected (10th)")
+            emit("  ✓ Version matches expected (10th)")
         else:
-            print(f"  ✗ Version mismatch! Expected: 10th, Got: {service.version_id}")
+            emit(f"  ✗ Version mismatch! Expected: 10th, Got: {service.version_id}")
             return False
 
-        print("  ✅ Test PASSED")
+        emit("  ✅ Test PASSED")
         return True
     except Exception as e:
-        print(f"  ❌ Test FAILED: {e}")
+        emit(f"  ❌ Test FAILED: {e}")
         import traceback
         traceback.print_exc()
         return False
 
+@flushes
 def test_default_service():
     """Test getting default service from config."""
-    print("\n📝 Test 3: Default Service")
-    print("-" * 40)
+    emit("\n📝 Test 3: Default Service")
+    emit("-" * 40)
 
     try:
         factory = get_service_factory()
-        print("  ✓ Got factory singleton")
+        emit("  ✓ Got factory singleton")
 
         service = factory.get_default_service()
-        print(f"  ✓ Got default service: {service.service_name}")
+        emit(f"  ✓ Got default service: {service.service_name}")
 
         if service is not None:
-            print("  ✓ Default service exists")
+            emit("  ✓ Default service exists")
         else:
-            print("  ✗ Default service is None!")
+            emit("  ✗ Default service is None!")
             return False
 
-        print("  ✅ Test PASSED")
+        emit("  ✅ Test PASSED")
         return True
     except Exception as e:
-        print(f"  ❌ Test FAILED: {e}")
+        emit(f"  ❌ Test FAILED: {e}")
         return False
 
+@flushes
 def test_wahapedia_service_methods():
     """Test Wahapedia service methods."""
-    print("\n📝 Test 4: Wahapedia Service Methods")
-    print("-" * 40)
+    emit("\n📝 Test 4: Wahapedia Service Methods")
+    emit("-" * 40)
 
     try:
-        factory = get_service_factory()
-        service = factory.create_service("wahapedia")
-        print("  ✓ Created Wahapedia service")
+        service = _wahapedia_service()
+        emit("  ✓ Got shared Wahapedia service")
 
         # Test get_factions method
-        print("\n  Testing get_factions()...")
+        emit("\n  Testing get_factions()...")
         factions = service.get_factions()
 
         if factions:
-            print(f"  ✓ Retrieved {len(factions)} factions")
-            print("  Sample factions:")
+            emit(f"  ✓ Retrieved {len(factions)} factions")
+            emit("  Sample factions:")
+            lines = []
             for i, faction in enumerate(factions[:3], 1):
-                print(f"    {i}. {faction.get('name', 'Unknown')} ({faction.get('code', 'N/A')})")
+                lines.append(f"    {i}. {faction.get('name', 'Unknown')} ({faction.get('code', 'N/A')})")
 
                 # Check required fields
                 if "source" in faction:
-                    print(f"       - Source: {faction['source']}")
+                    lines.append(f"       - Source: {faction['source']}")
                 if "version_id" in faction:
-                    print(f"       - Version: {faction['version_id']}")
-                else:
-                    print("  ⚠️  No factions retrieved")
+                    lines.append(f"       - Version: {faction['version_id']}")
+            emit("\n".join(lines))
+        else:
+            emit("  ⚠️  No factions retrieved")
 
         # Test get_army_rules method
-        print("\n  Testing get_army_rules()...")
+        emit("\n  Testing get_army_rules()...")
         if factions:
             test_faction = factions[0]
             army_rules = service.get_army_rules(test_faction)
             if army_rules:
-                print(f"  ✓ Got army rules for {test_faction.get('name')}")
-                print(f"    - Rule: {army_rules}")
+                emit(f"  ✓ Got army rules for {test_faction.get('name')}")
+                emit(f"    - Rule: {army_rules}")
             else:
-                print(f"  ℹ️  No army rules returned (may not be implemented)")
+                emit(f"  ℹ️  No army rules returned (may not be implemented)")
 
-        print("  ✅ Test PASSED")
+        emit("  ✅ Test PASSED")
         return True
     except Exception as e:
-        print(f"  ❌ Test FAILED: {e}")
+        emit(f"  ❌ Test FAILED: {e}")
         import traceback
         traceback.print_exc()
         return False
 
+@flushes
+def test_service_factory_singleton_threads():
+    """Test that concurrent first calls share one service factory."""
+    emit("\n📝 Test 5: Thread-safe Service Factory Singleton")
+    emit("-" * 40)
+
+    import threading
+    import src.core.service_factory as service_factory_module
+
+    # Start from an unbuilt factory so every thread races on creation, and
+    # put the original singleton back for the tests that follow
+    saved_factory = service_factory_module._factory_instance
+    service_factory_module._factory_instance = None
+    start = threading.Barrier(32)
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(get_service_factory())
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        service_factory_module._factory_instance = saved_factory
+
+    unique = len({id(factory) for factory in results})
+    emit(f"  ✓ {len(results)} threads returned {unique} factory instance(s)")
+
+    assert len(results) == 32
+    assert unique == 1
+    emit("  ✅ Test PASSED")
+    return True
+
+@flushes
 def run_all_tests():
     """Run all service factory tests."""
-    print("\n" + "🚀" * 30)
-    print(" SERVICE FACTORY TEST SUITE")
-    print("🚀" * 30)
+    emit("\n" + "🚀" * 30)
+    emit(" SERVICE FACTORY TEST SUITE")
+    emit("🚀" * 30)
 
     tests = [
             test_service_factory_creation,
             test_wahapedia_service_creation,
             test_default_service,
-            test_wahapedia_service_methods
+            test_wahapedia_service_methods,
+            test_service_factory_singleton_threads
             ]
 
     passed = 0
@@ -170,23 +220,23 @@ def run_all_tests():
             else:
                 failed += 1
         except Exception as e:
-            print(f"\n❌ Unexpected error in {test.__name__}: {e}")
+            emit(f"\n❌ Unexpected error in {test.__name__}: {e}")
             import traceback
             traceback.print_exc()
             failed += 1
 
     # Print summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    print(f"✅ Passed: {passed}")
-    print(f"❌ Failed: {failed}")
-    print(f"📊 Total: {passed + failed}")
+    emit("\n" + "=" * 60)
+    emit("TEST SUMMARY")
+    emit("=" * 60)
+    emit(f"✅ Passed: {passed}")
+    emit(f"❌ Failed: {failed}")
+    emit(f"📊 Total: {passed + failed}")
 
     if failed == 0:
-        print("\n🎉 ALL TESTS PASSED! 🎉")
+        emit("\n🎉 ALL TESTS PASSED! 🎉")
     else:
-        print(f"\n⚠️  {failed} test(s) failed. Check output above for details.")
+        emit(f"\n⚠️  {failed} test(s) failed. Check output above for details.")
 
     return failed == 0
 
@@ -4,15 +4,114 @@ Test suite for WahapediaURLConfig
 Tests URL building, faction code normalization, and pattern generation
 """
 import sys
-sys.path.insert(0, "/app/src")
+import functools
+
+from src.services.wahapedia.url_config import WahapediaURLConfig
+from tests._report import emit, flushes
+
+# Banner and separator lines, built once
+_RULE = "=" * 60
+_ROCKETS = "🚀" * 30
+
+
+@functools.cache
+def _url_config():
+    """One 10th edition URL config, shared by the tests"""
+    return WahapediaURLConfig("10th")
+
+
+# Test case tables, built once at import; expected URLs share the
+# 10th edition prefix
+_EDITION_URL = "https://wahapedia.ru/wh40k10ed"
+
+_FACTION_URL_CASES = (
+    # (faction_code, expected main URL, expected datasheets URL)
+    ("space-marines",
+     f"{_EDITION_URL}/factions/space-marines",
+     f"{_EDITION_URL}/factions/space-marines/datasheets"),
+    ("orks",
+     f"{_EDITION_URL}/factions/orks",
+     f"{_EDITION_URL}/factions/orks/datasheets"),
+    ("t-au-empire",
+     f"{_EDITION_URL}/factions/t-au-empire",
+     f"{_EDITION_URL}/factions/t-au-empire/datasheets"),
+)
+
+_SECTION_ANCHOR_CASES = (
+    # (faction, section, expected URL)
+    ("space-marines", "army_rules",
+     f"{_EDITION_URL}/factions/space-marines#Army-Rules"),
+    ("orks", "detachments",
+     f"{_EDITION_URL}/factions/orks#Detachment-Rules"),
+    ("necrons", "enhancements",
+     f"{_EDITION_URL}/factions/necrons#Enhancements"),
+)
+
+_NORMALIZATION_CASES = (
+    # (input name, expected code)
+    ("Space Marines", "space-marines"),
+    ("T'au Empire", "t-au-empire"),
+    ("Emperor's Children", "emperor-s-children"),
+    ("Adepta Sororitas", "adepta-sororitas"),
+    ("space-marines", "space-marines"),  # Already normalized
+    ("ORKS", "orks"),
+    ("Chaos Space Marines", "chaos-space-marines"),
+)
+
+_UNIT_DATASHEET_CASES = (
+    # (faction, unit, expected URL)
+    ("space-marines", "intercessor-squad",
+     f"{_EDITION_URL}/factions/space-marines/datasheets#intercessor-squad"),
+    ("orks", "boyz",
+     f"{_EDITION_URL}/factions/orks/datasheets#boyz"),
+)
+
+_SEARCH_URL_CASES = (
+    # (query, expected URL)
+    ("space marine captain",
+     f"{_EDITION_URL}/search?q=space+marine+captain"),
+    ("ork boyz",
+     f"{_EDITION_URL}/search?q=ork+boyz"),
+)
+
+_PATTERN_CASES = (
+    # (pattern, build_url kwargs, expected URL)
+    ("army_lists", {},
+     f"{_EDITION_URL}/army-lists/"),
+    ("faction_stratagems", {"faction_code": "space-marines"},
+     f"{_EDITION_URL}/factions/space-marines/stratagems"),
+    ("core_rules", {},
+     f"{_EDITION_URL}/the-rules/core-rules/"),
+)
+
+_VALID_FACTION_CODES = (
+    "space-marines",
+    "orks",
+    "necrons",
+    "t-au-empire",
+    "chaos-space-marines",
+)
+
+_INVALID_FACTION_CODES = (
+    "fake-faction",
+    "not-real",
+    "invalid-army",
+)
+
+_EXPECTED_ANCHORS = (
+    'army_rules',
+    'detachments',
+    'enhancements',
+    'stratagems',
+    'wargear_options',
+)
 
-from services.wahapedia.url_config import WahapediaURLConfig
 
 def print_test_header(test_name: str):
     """Print a formatted test header."""
-    print(f"\n{'='*60}")
-    print(f"TEST: {test_name}")
-    print('='*60)
+    emit(f"\n{_RULE}")
+    emit(f"TEST: {test_name}")
+    emit(_RULE)
 
 def print_result(description: str, expected: str, actual: str, passed: bool = None):
     """Print test result with formatting."""
@@ -20,327 +119,185 @@ def print_result(description: str, expected: str, actual: str, passed: bool = No
         passed = (expected == actual)
 
     status = "✅ PASS" if passed else "❌ FAIL"
-    print(f"\n{status}: {description}")
-    print(f"  Expected: {expected}")
-    print(f"  Actual:   {actual}")
+    emit(f"\n{status}: {description}")
+    emit(f"  Expected: {expected}")
+    emit(f"  Actual:   {actual}")
     if not passed:
-        print(f"  ⚠️  Mismatch detected!")
+        emit(f"  ⚠️  Mismatch detected!")
     return passed
 
+def _summarize(results) -> bool:
+    """Report pass/fail counts for a test's checks; True if all passed."""
+    tests_passed = sum(results)
+    tests_failed = len(results) - tests_passed
+    emit(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
+    return tests_failed == 0
+
+@flushes
 def test_basic_initialization():
     """Test basic URL config initialization."""
     print_test_header("Basic Initialization")
 
-    config = WahapediaURLConfig("10th")
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
     # Test version path mapping
     expected_path = "wh40k10ed"
     actual_path = config.get_version_path()
-    if print_result("Version path for 10th edition", expected_path, actual_path):
-        tests_passed += 1
-    else:
-        tests_failed += 1
+    results.append(print_result("Version path for 10th edition", expected_path, actual_path))
 
     # Test base URL
     expected_base = "https://wahapedia.ru"
     actual_base = config.get_base_url()
-    if print_result("Base URL", expected_base, actual_base):
-        tests_passed += 1
-    else:
-        tests_failed += 1
+    results.append(print_result("Base URL", expected_base, actual_base))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_quick_start_url():
     """Test quick start URL generation."""
     print_test_header("Quick Start URL")
 
-    config = WahapediaURLConfig("10th")
+    config = _url_config()
 
-    expected = "https://wahapedia.ru/wh40k10ed/the-rules/quick-start-guide/"
+    expected = f"{_EDITION_URL}/the-rules/quick-start-guide/"
     actual = config.get_quick_start_url()
 
     return print_result("Quick start guide URL", expected, actual)
 
+@flushes
 def test_faction_urls():
     """Test faction URL generation."""
     print_test_header("Faction URLs")
 
-    config = WahapediaURLConfig("10th")
-
-    test_cases = [
-            {
-                "faction_code": "space-marines",
-                "expected_main": "https://wahapedia.ru/wh40k10ed/factions/space-marines",
-                "expected_datasheets": "https://wahapedia.ru/wh40k10ed/factions/space-marines/datasheets"
-                },
-            {
-                "faction_code": "orks",
-                "expected_main": "https://wahapedia.ru/wh40k10ed/factions/orks",
-                "expected_datasheets": "https://wahapedia.ru/wh40k10ed/factions/orks/datasheets"
-                },
-            {
-                "faction_code": "t-au-empire",
-                "expected_main": "https://wahapedia.ru/wh40k10ed/factions/t-au-empire",
-                "expected_datasheets": "https://wahapedia.ru/wh40k10ed/factions/t-au-empire/datasheets"
-                }
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
-
-    for test in test_cases:
-        faction_code = test["faction_code"]
+    results = []
 
+    for faction_code, expected_main, expected_datasheets in _FACTION_URL_CASES:
         # Test main faction URL
         actual_main = config.get_faction_url(faction_code)
-        if print_result(f"Main URL for {faction_code}", test["expected_main"], actual_main):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(f"Main URL for {faction_code}", expected_main, actual_main))
 
         # Test datasheets URL
         actual_datasheets = config.get_faction_datasheets_url(faction_code)
-        if print_result(f"Datasheets URL for {faction_code}", test["expected_datasheets"], actual_datasheets):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(f"Datasheets URL for {faction_code}", expected_datasheets, actual_datasheets))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_section_anchors():
     """Test faction section URL generation with anchors."""
     print_test_header("Section Anchors")
 
-    config = WahapediaURLConfig("10th")
-
-    test_cases = [
-            {
-                "faction": "space-marines",
-                "section": "army_rules",
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/space-marines#Army-Rules"
-                },
-            {
-                "faction": "orks",
-                "section": "detachments",
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/orks#Detachment-Rules"
-                },
-            {
-                "faction": "necrons",
-                "section": "enhancements",
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/necrons#Enhancements"
-                }
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
-
-    for test in test_cases:
-        actual = config.get_faction_section_url(test["faction"], test["section"])
-        if print_result(
-                f"{test['section']} section for {test['faction']}", 
-                test["expected"], 
-                actual
-                ):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+    results = []
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    for faction, section, expected in _SECTION_ANCHOR_CASES:
+        actual = config.get_faction_section_url(faction, section)
+        results.append(print_result(f"{section} section for {faction}", expected, actual))
+
+    return _summarize(results)
 
+@flushes
 def test_faction_code_normalization():
     """Test faction code normalization."""
     print_test_header("Faction Code Normalization")
 
-    config = WahapediaURLConfig("10th")
+    config = _url_config()
 
-    test_cases = [
-            ("Space Marines", "space-marines"),
-            ("T'au Empire", "t-au-empire"),
-            ("Emperor's Children", "emperor-s-children"),
-            ("Adepta Sororitas", "adepta-sororitas"),
-            ("space-marines", "space-marines"),  # Already normalized
-            ("ORKS", "orks"),
-            ("Chaos Space Marines", "chaos-space-marines")
-            ]
-
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
-    for input_name, expected in test_cases:
+    for input_name, expected in _NORMALIZATION_CASES:
         actual = config.normalize_faction_code(input_name)
-        if print_result(f"Normalize '{input_name}'", expected, actual):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(f"Normalize '{input_name}'", expected, actual))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_unit_datasheet_url():
     """Test unit datasheet URL generation."""
     print_test_header("Unit Datasheet URLs")
 
-    config = WahapediaURLConfig("10th")
-
-    test_cases = [
-            {
-                "faction": "space-marines",
-                "unit": "intercessor-squad",
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/space-marines/datasheets#intercessor-squad"
-                },
-            {
-                "faction": "orks",
-                "unit": "boyz",
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/orks/datasheets#boyz"
-                }
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
-
-    for test in test_cases:
-        actual = config.get_unit_datasheet_url(test["faction"], test["unit"])
-        if print_result(
-                f"Unit datasheet for {test['unit']} in {test['faction']}", 
-                test["expected"], 
-                actual
-                ):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+    results = []
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    for faction, unit, expected in _UNIT_DATASHEET_CASES:
+        actual = config.get_unit_datasheet_url(faction, unit)
+        results.append(print_result(f"Unit datasheet for {unit} in {faction}", expected, actual))
 
+    return _summarize(results)
+
+@flushes
 def test_search_url():
     """Test search URL generation."""
     print_test_header("Search URL")
 
-    config = WahapediaURLConfig("10th")
-
-    test_cases = [
-            {
-                "query": "space marine captain",
-                "expected": "https://wahapedia.ru/wh40k10ed/search?q=space+marine+captain"
-                },
-            {
-                "query": "ork boyz",
-                "expected": "https://wahapedia.ru/wh40k10ed/search?q=ork+boyz"
-                }
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
-    for test in test_cases:
-        actual = config.get_search_url(test["query"])
-        if print_result(f"Search URL for '{test['query']}'", test["expected"], actual):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+    for query, expected in _SEARCH_URL_CASES:
+        actual = config.get_search_url(query)
+        results.append(print_result(f"Search URL for '{query}'", expected, actual))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_build_url_with_patterns():
     """Test generic URL building with patterns."""
     print_test_header("Generic URL Building")
 
-    config = WahapediaURLConfig("10th")
-
-    test_cases = [
-            {
-                "pattern": "army_lists",
-                "kwargs": {},
-                "expected": "https://wahapedia.ru/wh40k10ed/army-lists/"
-                },
-            {
-                "pattern": "faction_stratagems",
-                "kwargs": {"faction_code": "space-marines"},
-                "expected": "https://wahapedia.ru/wh40k10ed/factions/space-marines/stratagems"
-                },
-            {
-                "pattern": "core_rules",
-                "kwargs": {},
-                "expected": "https://wahapedia.ru/wh40k10ed/the-rules/core-rules/"
-                }
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
-    for test in test_cases:
-        actual = config.build_url(test["pattern"], **test["kwargs"])
-        description = f"Build URL for pattern '{test['pattern']}'"
-        if test["kwargs"]:
-            description += f" with {test['kwargs']}"
+    for pattern, kwargs, expected in _PATTERN_CASES:
+        actual = config.build_url(pattern, **kwargs)
+        description = f"Build URL for pattern '{pattern}'"
+        if kwargs:
+            description += f" with {kwargs}"
 
-        if print_result(description, test["expected"], actual or "None"):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(description, expected, actual or "None"))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_faction_validation():
     """Test faction code validation."""
     print_test_header("Faction Code Validation")
 
-    config = WahapediaURLConfig("10th")
-
-    valid_codes = [
-            "space-marines",
-            "orks",
-            "necrons",
-            "t-au-empire",
-            "chaos-space-marines"
-            ]
-
-    invalid_codes = [
-            "fake-faction",
-            "not-real",
-            "invalid-army"
-            ]
+    config = _url_config()
 
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
-    print("\nTesting valid faction codes:")
-    for code in valid_codes:
+    emit("\nTesting valid faction codes:")
+    for code in _VALID_FACTION_CODES:
         is_valid = config.validate_faction_code(code)
         expected = "Valid"
         actual = "Valid" if is_valid else "Invalid"
-        if print_result(f"Validate '{code}'", expected, actual):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(f"Validate '{code}'", expected, actual))
 
-    print("\nTesting invalid faction codes:")
-    for code in invalid_codes:
+    emit("\nTesting invalid faction codes:")
+    for code in _INVALID_FACTION_CODES:
         is_valid = config.validate_faction_code(code)
         expected = "Invalid"
         actual = "Valid" if is_valid else "Invalid"
-        if print_result(f"Validate '{code}'", expected, actual):
-            tests_passed += 1
-        else:
-            tests_failed += 1
+        results.append(print_result(f"Validate '{code}'", expected, actual))
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def test_cache_functionality():
     """Test URL caching."""
     print_test_header("URL Cache")
 
-    config = WahapediaURLConfig("10th")
+    config = _url_config()
+    # Start from an empty cache; earlier tests share this config
+    config.clear_cache()
 
     # Build same URL twice
     url1 = config.get_faction_url("space-marines")
@@ -348,55 +305,47 @@ def test_cache_functionality():
 
     # Should be the same
     if print_result("Cached URL matches", url1, url2):
-        print("  ✓ Cache is working for identical requests")
+        emit("  ✓ Cache is working for identical requests")
 
     # Clear cache
     config.clear_cache()
-    print("\n  ℹ️  Cache cleared")
+    emit("\n  ℹ️  Cache cleared")
 
     # Build again after clearing
     url3 = config.get_faction_url("space-marines")
     if print_result("URL after cache clear", url1, url3):
-        print("  ✓ URL generation consistent after cache clear")
+        emit("  ✓ URL generation consistent after cache clear")
 
     return True
 
+@flushes
 def test_all_section_anchors():
     """Test getting all section anchors."""
     print_test_header("All Section Anchors")
 
-    config = WahapediaURLConfig("10th")
+    config = _url_config()
     anchors = config.get_all_section_anchors()
 
-    expected_anchors = [
-            'army_rules',
-            'detachments',
-            'enhancements',
-            'stratagems',
-            'wargear_options'
-            ]
-
-    tests_passed = 0
-    tests_failed = 0
+    results = []
 
-    print("\nChecking for expected anchors:")
-    for anchor in expected_anchors:
-        if anchor in anchors:
-            print(f"  ✅ Found: {anchor} -> {anchors[anchor]}")
-            tests_passed += 1
+    emit("\nChecking for expected anchors:")
+    for anchor in _EXPECTED_ANCHORS:
+        found = anchor in anchors
+        if found:
+            emit(f"  ✅ Found: {anchor} -> {anchors[anchor]}")
         else:
-            print(f"  ❌ Missing: {anchor}")
-            tests_failed += 1
+            emit(f"  ❌ Missing: {anchor}")
+        results.append(found)
 
-    print(f"\n📊 Results: {tests_passed} passed, {tests_failed} failed")
-    return tests_failed == 0
+    return _summarize(results)
 
+@flushes
 def run_all_tests():
     """Run all URL config tests."""
-    print("\n" + "🚀" * 30)
-    print(" WAHAPEDIA URL CONFIG TEST SUITE")
-    print("🚀" * 30)
-    print("\nTesting 10th Edition URL Configuration")
+    emit(f"\n{_ROCKETS}")
+    emit(" WAHAPEDIA URL CONFIG TEST SUITE")
+    emit(_ROCKETS)
+    emit("\nTesting 10th Edition URL Configuration")
 
     test_functions = [
             test_basic_initialization,
@@ -418,32 +367,33 @@ def run_all_tests():
             result = test_func()
             results.append((test_func.__name__, result))
         except Exception as e:
-            print(f"\n❌ Test {test_func.__name__} crashed: {e}")
+            emit(f"\n❌ Test {test_func.__name__} crashed: {e}")
             import traceback
             traceback.print_exc()
             results.append((test_func.__name__, False))
 
     # Final summary
-    print("\n" + "=" * 60)
-    print("FINAL TEST SUMMARY")
-    print("=" * 60)
-
-    passed_tests = sum(1 for _, result in results if result)
-    failed_tests = len(results) - passed_tests
+    emit(f"\n{_RULE}")
+    emit("FINAL TEST SUMMARY")
+    emit(_RULE)
 
+    # Tally while listing each test, in a single pass over the results
+    passed_tests = 0
     for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status}: {test_name}")
+        if result:
+            passed_tests += 1
+        emit(f"{'✅ PASS' if result else '❌ FAIL'}: {test_name}")
+    failed_tests = len(results) - passed_tests
 
-    print(f"\n📊 Overall Results:")
-    print(f"  ✅ Passed: {passed_tests}/{len(results)}")
-    print(f"  ❌ Failed: {failed_tests}/{len(results)}")
+    emit(f"\n📊 Overall Results:")
+    emit(f"  ✅ Passed: {passed_tests}/{len(results)}")
+    emit(f"  ❌ Failed: {failed_tests}/{len(results)}")
 
     if failed_tests == 0:
-        print("\n🎉 ALL TESTS PASSED! 🎉")
-        print("The WahapediaURLConfig is working correctly for 10th edition.")
+        emit("\n🎉 ALL TESTS PASSED! 🎉")
+        emit("The WahapediaURLConfig is working correctly for 10th edition.")
     else:
-        print(f"\n⚠️  {failed_tests} test(s) failed. Please review the output above.")
+        emit(f"\n⚠️  {failed_tests} test(s) failed. Please review the output above.")
 
     return failed_tests == 0
 